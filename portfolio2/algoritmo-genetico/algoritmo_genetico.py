@@ -1,6 +1,15 @@
-import random
+import argparse
+import csv
+import json
 import math
-import matplotlib.pyplot as plt
+import multiprocessing as mp
+import os
+import random
+import time
+from collections import OrderedDict, deque
+from multiprocessing import shared_memory
+
+import numpy as np
 
 class Cidade:
     """Representa uma cidade com coordenadas (x, y)."""
@@ -14,158 +23,1119 @@ class Cidade:
         dist_y = self.y - outra_cidade.y
         return math.sqrt(dist_x**2 + dist_y**2)
 
+def carregar_tsplib(caminho):
+    """
+    Lê uma instância TSPLIB (.tsp) com NODE_COORD_SECTION.
+    Retorna as coordenadas como um array NumPy (n x 2), na ordem do arquivo,
+    e o cabeçalho (NAME, TYPE, EDGE_WEIGHT_TYPE, ...) como dicionário.
+    As distâncias do AG são sempre euclidianas sobre essas coordenadas.
+    """
+    cabecalho = {}
+    coordenadas = []
+    lendo_coordenadas = False
+    with open(caminho, encoding="utf-8") as f:
+        for linha in f:
+            linha = linha.strip()
+            if not linha:
+                continue
+            if lendo_coordenadas:
+                partes = linha.split()
+                if len(partes) >= 3 and partes[0].lstrip("-").isdigit():
+                    coordenadas.append((float(partes[1]), float(partes[2])))
+                    continue
+                lendo_coordenadas = False
+            if linha == "EOF":
+                break
+            if linha.startswith("NODE_COORD_SECTION"):
+                lendo_coordenadas = True
+            elif ":" in linha:
+                chave, valor = linha.split(":", 1)
+                cabecalho[chave.strip()] = valor.strip()
+    if not coordenadas:
+        raise ValueError(f"'{caminho}' não tem NODE_COORD_SECTION (tipo "
+                         f"{cabecalho.get('EDGE_WEIGHT_TYPE', 'desconhecido')}).")
+    dimensao = cabecalho.get("DIMENSION")
+    if dimensao is not None and int(dimensao) != len(coordenadas):
+        raise ValueError(f"'{caminho}' declara DIMENSION {dimensao}, mas tem {len(coordenadas)} cidades.")
+    return np.array(coordenadas, dtype=np.float64), cabecalho
+
+def calcular_matriz_distancias(cidades, saida=None):
+    """
+    Pré-calcula a matriz (n x n) de distâncias euclidianas entre as cidades.
+    É feita uma única vez; daí em diante, medir uma aresta é só um acesso
+    à matriz, em vez de chamar Cidade.distancia_para.
+
+    A matriz é float32 e é preenchida em blocos de linhas, então os
+    temporários em float64 ocupam poucos MB mesmo com dezenas de milhares
+    de cidades. 'saida' permite escrever direto num buffer já alocado
+    (p.ex. memória compartilhada).
+    """
+    xs = np.array([cidade.x for cidade in cidades], dtype=np.float64)
+    ys = np.array([cidade.y for cidade in cidades], dtype=np.float64)
+    n = len(xs)
+    if saida is None:
+        saida = np.empty((n, n), dtype=np.float32)
+    linhas_por_bloco = max(1, 2**20 // max(n, 1))
+    for i in range(0, n, linhas_por_bloco):
+        dx = xs[i:i + linhas_por_bloco, None] - xs[None, :]
+        dy = ys[i:i + linhas_por_bloco, None] - ys[None, :]
+        saida[i:i + linhas_por_bloco] = np.sqrt(dx * dx + dy * dy)
+    return saida
+
+def _decidir_matriz(usar_matriz, busca_local, num_sementes_heuristicas):
+    """
+    Política de usar_matriz=None: a matriz n x n só é montada quando nada
+    usa o índice espacial. Com busca local ou sementes heurísticas (o modo
+    para instâncias grandes), as arestas são medidas pelas coordenadas.
+    """
+    if usar_matriz is None:
+        return not (busca_local or num_sementes_heuristicas > 0)
+    return usar_matriz
+
+class IndiceEspacial:
+    """
+    Índice espacial em grade uniforme sobre as coordenadas das cidades.
+    As cidades são ordenadas pela célula em que caem (O(n log n)), de modo
+    que cada coluna da grade é um trecho contíguo de 'ordem'. As consultas
+    examinam anéis de células ao redor do ponto, sem nunca montar a matriz
+    n x n de distâncias.
+    """
+    def __init__(self, cidades, cidades_por_celula=2):
+        self.coordenadas = np.array([[cidade.x, cidade.y] for cidade in cidades], dtype=np.float64)
+        self.n = len(self.coordenadas)
+        minimo = self.coordenadas.min(axis=0)
+        extensao = np.maximum(self.coordenadas.max(axis=0) - minimo, 1e-9)
+        # Lado da célula escolhido para ter, em média, 'cidades_por_celula' cidades
+        self.lado = max(math.sqrt(extensao[0] * extensao[1] * cidades_por_celula / self.n),
+                        extensao.max() / max(self.n, 1), 1e-9)
+        self.colunas_grade, self.linhas_grade = (extensao // self.lado).astype(int) + 1
+        self.minimo = minimo
+
+        self.celula_x, self.celula_y = self._celula(self.coordenadas)
+        ids = self.celula_x * self.linhas_grade + self.celula_y
+        self.ordem = np.argsort(ids, kind="stable")
+        self.inicio = np.searchsorted(ids[self.ordem], np.arange(self.colunas_grade * self.linhas_grade + 1))
+
+    def _celula(self, pontos):
+        celulas = ((pontos - self.minimo) // self.lado).astype(int)
+        return (np.clip(celulas[..., 0], 0, self.colunas_grade - 1),
+                np.clip(celulas[..., 1], 0, self.linhas_grade - 1))
+
+    def _cidades_no_quadrado(self, cx, cy, raio):
+        """Índices das cidades nas células a no máximo 'raio' células de (cx, cy)."""
+        y0, y1 = max(cy - raio, 0), min(cy + raio, self.linhas_grade - 1)
+        trechos = []
+        for x in range(max(cx - raio, 0), min(cx + raio, self.colunas_grade - 1) + 1):
+            base = x * self.linhas_grade
+            trechos.append(self.ordem[self.inicio[base + y0]:self.inicio[base + y1 + 1]])
+        return np.concatenate(trechos)
+
+    def k_vizinhos(self, k):
+        """
+        Para cada cidade, os índices das k cidades mais próximas, da mais
+        próxima para a mais distante. As consultas são feitas em bloco por
+        célula; o quadrado de busca cresce até que a k-ésima distância de
+        todas as cidades da célula caiba no raio garantido pela grade.
+        """
+        k = min(k, self.n - 1)
+        vizinhos = np.empty((self.n, k), dtype=np.intp)
+        if k <= 0:
+            return vizinhos
+        raio_maximo = max(self.colunas_grade, self.linhas_grade)
+        for celula in np.flatnonzero(np.diff(self.inicio)):
+            cx, cy = divmod(int(celula), self.linhas_grade)
+            pontos = self.ordem[self.inicio[celula]:self.inicio[celula + 1]]
+            raio = 1
+            while True:
+                candidatos = self._cidades_no_quadrado(cx, cy, raio)
+                if len(candidatos) > k:
+                    diferencas = self.coordenadas[pontos, None, :] - self.coordenadas[None, candidatos, :]
+                    distancias = np.sqrt((diferencas ** 2).sum(axis=-1))
+                    distancias[pontos[:, None] == candidatos[None, :]] = np.inf
+                    escolhidos = np.argpartition(distancias, k - 1, axis=1)[:, :k]
+                    d_escolhidos = np.take_along_axis(distancias, escolhidos, axis=1)
+                    # Cidades fora do quadrado estão a pelo menos raio * lado de distância
+                    if d_escolhidos.max() <= raio * self.lado or raio >= raio_maximo:
+                        ordem_local = np.argsort(d_escolhidos, axis=1)
+                        vizinhos[pontos] = candidatos[np.take_along_axis(escolhidos, ordem_local, axis=1)]
+                        break
+                raio += 1
+        return vizinhos
+
+    def _conjuntos_livres(self, indices):
+        """Distribui os índices dados em conjuntos por célula, para busca com remoção."""
+        livres = {}
+        for i in indices:
+            livres.setdefault((int(self.celula_x[i]), int(self.celula_y[i])), set()).add(int(i))
+        return livres
+
+    def _mais_proximo_livre(self, origem, livres):
+        """
+        Cidade livre mais próxima de 'origem', examinando anéis de células
+        cada vez maiores. Depois do anel r, toda cidade ainda não vista está a
+        pelo menos r * lado de distância, o que permite parar cedo.
+        """
+        ox, oy = self.coordenadas[origem]
+        cx, cy = int(self.celula_x[origem]), int(self.celula_y[origem])
+        melhor, melhor_dist = None, math.inf
+        raio_maximo = max(self.colunas_grade, self.linhas_grade)
+        for raio in range(raio_maximo + 1):
+            for x in range(cx - raio, cx + raio + 1):
+                passo = 1 if abs(x - cx) == raio else 2 * raio
+                for y in range(cy - raio, cy + raio + 1, max(passo, 1)):
+                    for i in livres.get((x, y), ()):
+                        d = math.hypot(self.coordenadas[i, 0] - ox, self.coordenadas[i, 1] - oy)
+                        if d < melhor_dist:
+                            melhor, melhor_dist = i, d
+            if melhor is not None and melhor_dist <= raio * self.lado:
+                break
+        return melhor
+
+    def _remover_livre(self, i, livres):
+        chave = (int(self.celula_x[i]), int(self.celula_y[i]))
+        conjunto = livres.get(chave)
+        if conjunto is not None:
+            conjunto.discard(i)
+            if not conjunto:
+                del livres[chave]
+
+    def rota_vizinho_mais_proximo(self, inicio=0):
+        """Rota do vizinho mais próximo: sempre segue para a cidade livre mais próxima."""
+        livres = self._conjuntos_livres(range(self.n))
+        rota = [inicio]
+        self._remover_livre(inicio, livres)
+        while livres:
+            proxima = self._mais_proximo_livre(rota[-1], livres)
+            self._remover_livre(proxima, livres)
+            rota.append(proxima)
+        return np.array(rota)
+
+    def rota_gulosa(self, k=10):
+        """
+        Construção gulosa por arestas: percorre as arestas candidatas (dos k
+        vizinhos mais próximos) da menor para a maior e aceita as que não
+        deixam uma cidade com grau 3 nem fecham um ciclo prematuro. Os
+        fragmentos resultantes são ligados pelo extremo livre mais próximo.
+        """
+        n = self.n
+        if n < 3:
+            return np.arange(n)
+        vizinhos = self.k_vizinhos(k)
+        origem = np.repeat(np.arange(n), vizinhos.shape[1])
+        destino = vizinhos.ravel()
+        pares = np.unique(np.minimum(origem, destino) * n + np.maximum(origem, destino))
+        a, b = np.divmod(pares, n)
+        comprimentos = np.hypot(*(self.coordenadas[a] - self.coordenadas[b]).T)
+        ordem = np.argsort(comprimentos, kind="stable")
+
+        grau = [0] * n
+        pai = list(range(n))  # Union-find para detectar ciclos
+
+        def raiz(i):
+            while pai[i] != i:
+                pai[i] = pai[pai[i]]
+                i = pai[i]
+            return i
+
+        adjacentes = [[] for _ in range(n)]
+        for i, j in zip(a[ordem].tolist(), b[ordem].tolist()):
+            if grau[i] < 2 and grau[j] < 2:
+                ri, rj = raiz(i), raiz(j)
+                if ri != rj:
+                    pai[ri] = rj
+                    grau[i] += 1
+                    grau[j] += 1
+                    adjacentes[i].append(j)
+                    adjacentes[j].append(i)
+
+        # Liga os fragmentos: percorre um até o outro extremo e salta para o
+        # extremo livre mais próximo de outro fragmento
+        extremos = [i for i in range(n) if grau[i] < 2]
+        livres = self._conjuntos_livres(extremos)
+        visitada = [False] * n
+        rota = []
+        atual = extremos[0]
+        while True:
+            self._remover_livre(atual, livres)
+            anterior = None
+            while True:
+                visitada[atual] = True
+                rota.append(atual)
+                proximos = [v for v in adjacentes[atual] if v != anterior and not visitada[v]]
+                if not proximos:
+                    break
+                anterior, atual = atual, proximos[0]
+            # 'atual' é agora o outro extremo do fragmento
+            self._remover_livre(atual, livres)
+            if not livres:
+                break
+            atual = self._mais_proximo_livre(atual, livres)
+        return np.array(rota)
+
+class BuscaLocal:
+    """
+    Melhoria local de rotas com movimentos 2-opt e Or-opt.
+    Só são testados movimentos que criam uma aresta para um dos k vizinhos
+    mais próximos (listas de candidatos), cada movimento é avaliado em O(1)
+    pela diferença das arestas trocadas e bits "não olhe" mantêm numa fila
+    apenas as cidades cujas arestas mudaram recentemente.
+
+    Os deltas precisam usar os mesmos comprimentos de aresta que mediram a
+    rota, senão a distância atualizada deriva da real: com 'matriz_distancias'
+    cada aresta é lida da matriz (float32); sem ela, é calculada das
+    coordenadas pela mesma fórmula de calcular_matriz_distancias.
+    """
+    EPSILON = 1e-9
+
+    def __init__(self, cidades, vizinhos, tamanho_max_segmento=3, matriz_distancias=None):
+        self.xs = [float(cidade.x) for cidade in cidades]
+        self.ys = [float(cidade.y) for cidade in cidades]
+        self.vizinhos = [list(map(int, linha)) for linha in vizinhos]
+        self.tamanho_max_segmento = tamanho_max_segmento
+        if matriz_distancias is not None:
+            # item() devolve o float32 da matriz como float do Python, sem criar array
+            self._dist = matriz_distancias.item
+
+    def _dist(self, a, b):
+        dx, dy = self.xs[a] - self.xs[b], self.ys[a] - self.ys[b]
+        return math.sqrt(dx * dx + dy * dy)
+
+    def otimizar(self, rota):
+        """
+        Aplica 2-opt e Or-opt até não haver melhoria.
+        Retorna a nova rota e a variação total do comprimento (soma dos deltas
+        dos movimentos aplicados), sem remedir a rota inteira.
+        """
+        self.rota = [int(cidade) for cidade in rota]
+        self.delta = 0.0
+        n = len(self.rota)
+        if n < 5:
+            return np.array(self.rota), 0.0
+        self.pos = [0] * n
+        for i, cidade in enumerate(self.rota):
+            self.pos[cidade] = i
+
+        # Bit "não olhe" desligado = cidade na fila de cidades a examinar
+        self.fila = deque(self.rota)
+        self.na_fila = [True] * n
+        while self.fila:
+            a = self.fila.popleft()
+            self.na_fila[a] = False
+            if self._tentar_2opt(a) or self._tentar_or_opt(a):
+                self._ativar(a)
+        return np.array(self.rota), self.delta
+
+    def _ativar(self, *cidades):
+        for cidade in cidades:
+            if not self.na_fila[cidade]:
+                self.na_fila[cidade] = True
+                self.fila.append(cidade)
+
+    def _sucessor(self, cidade):
+        return self.rota[(self.pos[cidade] + 1) % len(self.rota)]
+
+    def _antecessor(self, cidade):
+        return self.rota[self.pos[cidade] - 1]
+
+    def _inverter(self, i, j):
+        """Inverte o trecho circular rota[i..j], ou o complementar se for menor."""
+        n = len(self.rota)
+        tamanho = (j - i) % n + 1
+        if 2 * tamanho > n:
+            i, j = (j + 1) % n, (i - 1) % n
+            tamanho = n - tamanho
+        rota, pos = self.rota, self.pos
+        for _ in range(tamanho // 2):
+            a, b = rota[i], rota[j]
+            rota[i], rota[j] = b, a
+            pos[b], pos[a] = i, j
+            i = (i + 1) % n
+            j = (j - 1) % n
+
+    def _tentar_2opt(self, a):
+        """
+        Troca as arestas (a, b) e (c, d) por (a, c) e (b, d), onde c é um
+        vizinho próximo de a; testa a aresta de a para o sucessor e para o
+        antecessor.
+        """
+        dist = self._dist
+        for para_frente in (True, False):
+            b = self._sucessor(a) if para_frente else self._antecessor(a)
+            d_ab = dist(a, b)
+            for c in self.vizinhos[a]:
+                d_ac = dist(a, c)
+                if d_ac >= d_ab:
+                    break  # Vizinhos mais distantes não podem gerar ganho
+                d = self._sucessor(c) if para_frente else self._antecessor(c)
+                if c == b or d == a:
+                    continue
+                delta = d_ac + dist(b, d) - d_ab - dist(c, d)
+                if delta < -self.EPSILON:
+                    self.delta += delta
+                    if para_frente:
+                        self._inverter(self.pos[b], self.pos[c])
+                    else:
+                        self._inverter(self.pos[a], self.pos[d])
+                    self._ativar(b, c, d)
+                    return True
+        return False
+
+    def _tentar_or_opt(self, a):
+        """
+        Move o trecho de 1 a 'tamanho_max_segmento' cidades que começa em a
+        para junto de um vizinho próximo de a, em qualquer orientação.
+        """
+        dist = self._dist
+        n = len(self.rota)
+        i = self.pos[a]
+        for tamanho in range(1, self.tamanho_max_segmento + 1):
+            if tamanho + 3 > n:
+                break
+            s1, s2 = a, self.rota[(i + tamanho - 1) % n]
+            p, prox = self._antecessor(s1), self._sucessor(s2)
+            ganho_remocao = dist(p, s1) + dist(s2, prox) - dist(p, prox)
+            if ganho_remocao <= self.EPSILON:
+                continue
+            segmento = {self.rota[(i + t) % n] for t in range(tamanho)}
+            for c in self.vizinhos[s1]:
+                d_c_s1 = dist(c, s1)
+                if d_c_s1 >= ganho_remocao:
+                    break
+                if c in segmento:
+                    continue
+                # Inserção entre c e seu sucessor, ou entre o antecessor de c e c
+                for e, c_antes in ((self._sucessor(c), True), (self._antecessor(c), False)):
+                    if e in segmento:
+                        continue
+                    # Com c_antes, a ordem fica c, s1..s2, e; senão e, s2..s1, c
+                    delta = d_c_s1 + dist(s2, e) - dist(c, e) - ganho_remocao
+                    if delta < -self.EPSILON:
+                        self.delta += delta
+                        self._mover_segmento(i, tamanho, c if c_antes else e, inverter=not c_antes)
+                        self._ativar(p, prox, s1, s2, c, e)
+                        return True
+        return False
+
+    def _mover_segmento(self, i, tamanho, apos, inverter):
+        """Remove o trecho rota[i:i+tamanho] e o reinsere logo após a cidade 'apos'."""
+        n = len(self.rota)
+        segmento = [self.rota[(i + t) % n] for t in range(tamanho)]
+        if inverter:
+            segmento.reverse()
+        resto = [self.rota[(i + tamanho + t) % n] for t in range(n - tamanho)]
+        k = (self.pos[apos] - (i + tamanho)) % n
+        self.rota = resto[:k + 1] + segmento + resto[k + 1:]
+        for j, cidade in enumerate(self.rota):
+            self.pos[cidade] = j
+
+class CacheFitness:
+    """
+    Cache LRU limitado de distâncias de rotas.
+    A chave é o hash dos bytes do vetor da rota, calculado em C, o que é
+    bem mais barato que montar uma tupla de Python por indivíduo.
+    """
+    def __init__(self, capacidade=100_000):
+        self.capacidade = capacidade
+        self._dados = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+
+    @staticmethod
+    def chave(rota):
+        return hash(rota.tobytes())
+
+    def obter(self, chave):
+        """Retorna a distância guardada (ou None) e marca a entrada como recente."""
+        distancia = self._dados.get(chave)
+        if distancia is None:
+            self.falhas += 1
+            return None
+        self._dados.move_to_end(chave)
+        self.acertos += 1
+        return distancia
+
+    def guardar(self, chave, distancia):
+        self._dados[chave] = distancia
+        self._dados.move_to_end(chave)
+        if len(self._dados) > self.capacidade:
+            self._dados.popitem(last=False)
+
+class Populacao:
+    """
+    Conjunto de indivíduos que carrega, junto com cada rota, sua distância.
+    'rotas' é uma matriz (tamanho x num_cidades); 'distancias[i]' é NaN
+    enquanto o indivíduo i ainda não foi avaliado. Indivíduos repetidos são
+    mantidos, preservando a pressão seletiva.
+    """
+    def __init__(self, rotas, distancias=None):
+        self.rotas = np.asarray(rotas)
+        if distancias is None:
+            distancias = np.full(len(self.rotas), np.nan)
+        self.distancias = np.asarray(distancias, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.rotas)
+
+    @property
+    def fitness(self):
+        return 1 / self.distancias
+
+    def indice_melhor(self):
+        return int(np.nanargmin(self.distancias))
+
 class ResolvedorTSP_AG:
     """
     Classe que encapsula a lógica do Algoritmo Genético para o TSP.
+
+    Internamente, cada rota é uma permutação dos índices das cidades
+    (vetor NumPy de inteiros) e a população é uma matriz
+    (tam_populacao x num_cidades).
+
+    As arestas são medidas na matriz de distâncias (float32) ou, sem ela,
+    calculadas das coordenadas; 'usar_matriz' escolhe (None = automático,
+    ver _decidir_matriz). Sem matriz, a memória fica O(n) em vez de O(n²).
+
+    Com 'checkpoint', população, histórico e geradores aleatórios vêm do
+    arquivo e a população inicial (sementes e busca local) nem é criada.
     """
-    def __init__(self, cidades, tam_populacao, taxa_mutacao, taxa_crossover, num_geracoes):
+    METODOS_SELECAO = ("torneio", "sus", "ranking")
+
+    def __init__(self, cidades, tam_populacao, taxa_mutacao, taxa_crossover, num_geracoes,
+                 capacidade_cache=100_000, metodo_selecao="torneio", tamanho_torneio=5,
+                 pressao_ranking=1.5, matriz_distancias=None, busca_local=False,
+                 k_vizinhos=8, operador_crossover="ox", operador_mutacao="troca",
+                 num_sementes_heuristicas=0, usar_matriz=None, checkpoint=None):
+        if metodo_selecao not in self.METODOS_SELECAO:
+            raise ValueError(f"Método de seleção desconhecido: {metodo_selecao!r}")
+        # Operadores em lote: recebem e devolvem matrizes (filhos x cidades);
+        # as mutações devolvem também a variação de comprimento de cada rota
+        self.operadores_crossover = {"ox": self._crossover_ox_lote, "pmx": self._crossover_pmx_lote}
+        self.operadores_mutacao = {
+            "troca": self._mutacao_troca_lote,
+            "inversao": self._mutacao_inversao_lote,
+            "insercao": self._mutacao_insercao_lote,
+        }
+        if operador_crossover not in self.operadores_crossover:
+            raise ValueError(f"Operador de crossover desconhecido: {operador_crossover!r}")
+        if operador_mutacao not in self.operadores_mutacao:
+            raise ValueError(f"Operador de mutação desconhecido: {operador_mutacao!r}")
         self.cidades = cidades
+        self.num_cidades = len(cidades)
         self.tam_populacao = tam_populacao
         self.taxa_mutacao = taxa_mutacao
         self.taxa_crossover = taxa_crossover
         self.num_geracoes = num_geracoes
-        self.populacao = self._criar_populacao_inicial()
+        self.metodo_selecao = metodo_selecao
+        self.tamanho_torneio = tamanho_torneio
+        self.pressao_ranking = pressao_ranking  # Entre 1 (sem pressão) e 2 (máxima)
+        self.operador_crossover = operador_crossover
+        self.operador_mutacao = operador_mutacao
+        self.xs = np.array([cidade.x for cidade in cidades], dtype=np.float64)
+        self.ys = np.array([cidade.y for cidade in cidades], dtype=np.float64)
+        # Uma matriz já pronta (p.ex. em memória compartilhada) pode ser reaproveitada
+        if matriz_distancias is None and _decidir_matriz(usar_matriz, busca_local, num_sementes_heuristicas):
+            matriz_distancias = calcular_matriz_distancias(cidades)
+        self.matriz_distancias = matriz_distancias
+        self.num_sementes_heuristicas = min(num_sementes_heuristicas, tam_populacao)
+        # O índice espacial só é montado se algo precisar de vizinhança
+        self.indice_espacial = None
+        if busca_local or self.num_sementes_heuristicas > 0:
+            self.indice_espacial = IndiceEspacial(cidades)
+        # Estágio memético opcional: cada rota nova passa por 2-opt/Or-opt
+        self.busca_local = None
+        if busca_local:
+            self.busca_local = BuscaLocal(cidades, self.indice_espacial.k_vizinhos(k_vizinhos),
+                                          matriz_distancias=self.matriz_distancias)
+        self.melhor_distancia = None
+        self.cache_fitness = CacheFitness(capacidade_cache)
+        self.avaliacoes = 0  # Rotas efetivamente medidas na matriz de distâncias
+        self.geracao = 0
+        self.historico_distancias = []
+        self.atualizacoes_delta = 0  # Distâncias atualizadas só pelas arestas trocadas
+        self.tempo_decorrido = 0.0  # Segundos de evolução, somando execuções retomadas
+        if checkpoint is None:
+            self.populacao = self._criar_populacao_inicial()
+        else:
+            self.carregar_checkpoint(checkpoint)
 
     def _criar_populacao_inicial(self):
-        """Cria uma população inicial de rotas aleatórias."""
-        populacao = []
-        for _ in range(self.tam_populacao):
-            # Cria uma rota embaralhando uma cópia da lista de cidades
-            rota = random.sample(self.cidades, len(self.cidades))
-            populacao.append(rota)
+        """
+        Cria uma população inicial de rotas aleatórias (uma permutação por linha).
+        Opcionalmente, as primeiras 'num_sementes_heuristicas' rotas são
+        construídas pelo índice espacial: uma gulosa por arestas e as demais
+        pelo vizinho mais próximo a partir de cidades iniciais sorteadas.
+        """
+        # argsort de valores aleatórios gera uma permutação uniforme por linha
+        rotas = np.argsort(np.random.random((self.tam_populacao, self.num_cidades)), axis=1)
+        if self.num_sementes_heuristicas > 0:
+            rotas[0] = self.indice_espacial.rota_gulosa()
+            for i in range(1, self.num_sementes_heuristicas):
+                inicio = random.randrange(self.num_cidades)
+                rotas[i] = self.indice_espacial.rota_vizinho_mais_proximo(inicio)
+        populacao = Populacao(rotas)
+        self._aplicar_busca_local(populacao, np.arange(len(populacao)))
         return populacao
 
+    def _aplicar_busca_local(self, populacao, indices):
+        """
+        Melhora com a busca local as rotas indicadas (as novas da geração).
+        As rotas são avaliadas antes e a distância é atualizada pelo delta dos
+        movimentos, em vez de ser remedida depois.
+        """
+        if self.busca_local is None or len(indices) == 0:
+            return
+        self._avaliar(populacao)
+        for i in indices:
+            populacao.rotas[i], delta = self.busca_local.otimizar(populacao.rotas[i])
+            populacao.distancias[i] += delta
+        self.atualizacoes_delta += len(indices)
+
+    def _avaliar(self, populacao):
+        """
+        Preenche as distâncias ainda desconhecidas da população.
+        Consulta o cache primeiro e mede todas as rotas restantes numa única
+        chamada vetorizada; cada indivíduo é avaliado no máximo uma vez.
+        """
+        pendentes = np.flatnonzero(np.isnan(populacao.distancias))
+        if len(pendentes) == 0:
+            return
+        chaves = [CacheFitness.chave(populacao.rotas[i]) for i in pendentes]
+        a_medir = []
+        for i, chave in zip(pendentes, chaves):
+            distancia = self.cache_fitness.obter(chave)
+            if distancia is None:
+                a_medir.append(i)
+            else:
+                populacao.distancias[i] = distancia
+        if a_medir:
+            medidas = self._calcular_distancias(populacao.rotas[a_medir])
+            populacao.distancias[a_medir] = medidas
+            self.avaliacoes += len(a_medir)
+        for i, chave in zip(pendentes, chaves):
+            self.cache_fitness.guardar(chave, float(populacao.distancias[i]))
+
+    def _comprimentos(self, a, b):
+        """Comprimento das arestas (a[i], b[i]), da matriz ou das coordenadas, em float64."""
+        if self.matriz_distancias is not None:
+            return self.matriz_distancias[a, b].astype(np.float64)
+        dx, dy = self.xs[a] - self.xs[b], self.ys[a] - self.ys[b]
+        return np.sqrt(dx * dx + dy * dy)
+
+    def _calcular_distancias(self, populacao):
+        """
+        Calcula o comprimento de todas as rotas de uma vez.
+        Para cada linha, junta as arestas (rota[i], rota[i+1]) — a última
+        volta para a primeira cidade — e soma seus comprimentos.
+        """
+        populacao = np.asarray(populacao)
+        proximas = np.roll(populacao, -1, axis=-1)
+        return self._comprimentos(populacao, proximas).sum(axis=-1)
+
     def _calcular_fitness(self, rota):
         """Calcula o fitness de uma rota (inverso da distância total)."""
-        distancia_total = 0
-        for i in range(len(rota)):
-            cidade_origem = rota[i]
-            # Se for a última cidade, a próxima é a primeira (ciclo)
-            cidade_destino = rota[0] if i + 1 == len(rota) else rota[i + 1]
-            distancia_total += cidade_origem.distancia_para(cidade_destino)
-        
         # O fitness é o inverso da distância para que rotas menores tenham maior valor.
-        return 1 / distancia_total
+        return 1 / self._calcular_distancias(rota)
 
-    def _selecao_torneio(self, fitness_populacao, tamanho_torneio=5):
-        """Seleciona um indivíduo para ser pai usando o método de torneio."""
-        
-        # Converte o dicionário de fitness em uma lista de competidores (tuplas)
-        lista_competidores = list(fitness_populacao.items())
-        
-        # Garante que o tamanho do torneio não seja maior que o número de
-        # indivíduos únicos disponíveis na população.
-        tamanho_real_torneio = min(tamanho_torneio, len(lista_competidores))
-        
-        # Se, por algum motivo, a lista estiver vazia, retorna o primeiro que encontrar
-        # (embora isso seja raro devido ao elitismo)
-        if tamanho_real_torneio == 0:
-            return lista_competidores[0][0] 
-        
-        # Seleciona N competidores aleatórios da população
-        competidores = random.sample(lista_competidores, tamanho_real_torneio)
-        
-        # O vencedor do torneio é aquele com o maior fitness
-        vencedor = max(competidores, key=lambda item: item[1])
-        return vencedor[0] # Retorna a rota (a chave do dicionário)
+    def _selecao_torneio(self, distancias, quantidade):
+        """
+        Seleção por torneio vetorizada: sorteia 'quantidade' torneios de
+        'tamanho_torneio' competidores (por índice, com reposição) e retorna o
+        índice do vencedor de cada um. Custo O(k) por pai selecionado.
+        """
+        competidores = np.random.randint(0, len(distancias), size=(quantidade, self.tamanho_torneio))
+        # O vencedor do torneio é aquele com a menor distância (maior fitness)
+        vencedores = np.argmin(distancias[competidores], axis=1)
+        return competidores[np.arange(quantidade), vencedores]
 
-    def _crossover_ordenado(self, pai1, pai2):
+    def _amostragem_universal(self, pesos, quantidade):
         """
-        Executa o Crossover Ordenado (OX1) para criar um filho.
-        Este método preserva a ordem relativa das cidades dos pais.
+        Amostragem universal estocástica (SUS): um único sorteio posiciona
+        'quantidade' ponteiros igualmente espaçados sobre a roleta acumulada.
         """
-        filho = [None] * len(pai1)
-        
-        # Seleciona um subconjunto aleatório do primeiro pai
-        inicio, fim = sorted(random.sample(range(len(pai1)), 2))
-        
-        # Copia o subconjunto do pai1 para o filho
-        subconjunto_pai1 = pai1[inicio:fim]
-        filho[inicio:fim] = subconjunto_pai1
-        
-        # Preenche o resto do filho com as cidades do pai2, na ordem em que aparecem,
-        # sem duplicar as cidades que já vieram do pai1.
-        ponteiro_pai2 = 0
-        for i in range(len(filho)):
-            if filho[i] is None:
-                while pai2[ponteiro_pai2] in subconjunto_pai1:
-                    ponteiro_pai2 += 1
-                filho[i] = pai2[ponteiro_pai2]
-                ponteiro_pai2 += 1
-                
-        return filho
+        acumulado = np.cumsum(pesos)
+        passo = acumulado[-1] / quantidade
+        ponteiros = np.random.uniform(0, passo) + passo * np.arange(quantidade)
+        indices = np.searchsorted(acumulado, ponteiros, side="right")
+        # Evita estouro de índice por arredondamento no último ponteiro
+        indices = np.minimum(indices, len(pesos) - 1)
+        # Embaralha para que pais consecutivos não sejam sempre vizinhos na roleta
+        np.random.shuffle(indices)
+        return indices
 
-    def _mutacao_troca(self, rota):
+    def _selecao_sus(self, distancias, quantidade):
+        """Seleção proporcional ao fitness (1/distância) via SUS."""
+        return self._amostragem_universal(1 / distancias, quantidade)
+
+    def _selecao_ranking(self, distancias, quantidade):
+        """
+        Seleção por ranking linear: o peso depende só da posição do indivíduo
+        na ordenação, não da escala das distâncias. O pior recebe 2 - s e o
+        melhor recebe s, onde s é a pressão seletiva.
+        """
+        tamanho = len(distancias)
+        if tamanho == 1:
+            return np.zeros(quantidade, dtype=np.intp)
+        # posicao 0 = pior indivíduo (maior distância)
+        posicoes = np.empty(tamanho)
+        posicoes[np.argsort(-distancias, kind="stable")] = np.arange(tamanho)
+        s = self.pressao_ranking
+        pesos = (2 - s) + 2 * (s - 1) * posicoes / (tamanho - 1)
+        return self._amostragem_universal(pesos, quantidade)
+
+    def _selecionar_pais(self, populacao, quantidade):
+        """Seleciona de uma vez os índices de todos os pais da geração."""
+        if self.metodo_selecao == "sus":
+            return self._selecao_sus(populacao.distancias, quantidade)
+        if self.metodo_selecao == "ranking":
+            return self._selecao_ranking(populacao.distancias, quantidade)
+        return self._selecao_torneio(populacao.distancias, quantidade)
+
+    def _sortear_trechos(self, quantidade, comprimento_minimo=1):
+        """
+        Sorteia, para cada linha, duas posições distintas inicio < fim
+        (equivalente vetorizado de sorted(random.sample(range(n), 2))).
+        Devolve colunas (quantidade x 1), prontas para broadcast.
+        """
+        pos1 = np.random.randint(0, self.num_cidades, quantidade)
+        pos2 = np.random.randint(0, self.num_cidades - 1, quantidade)
+        pos2 += pos2 >= pos1
+        inicio, fim = np.minimum(pos1, pos2), np.maximum(pos1, pos2)
+        fim = np.minimum(fim + (comprimento_minimo - 1), self.num_cidades)
+        return inicio[:, None], fim[:, None]
+
+    def _crossover_ox_lote(self, pais1, pais2):
+        """
+        Crossover Ordenado (OX1) em lote sobre matrizes (filhos x cidades).
+        Cada filho recebe um trecho aleatório do pai1 e as posições restantes
+        são preenchidas, da esquerda para a direita, com as cidades do pai2
+        na ordem em que aparecem, sem duplicar as que vieram do pai1.
+        """
+        quantidade = len(pais1)
+        linhas = np.arange(quantidade)[:, None]
+        colunas = np.arange(self.num_cidades)[None, :]
+        inicio, fim = self._sortear_trechos(quantidade)
+        no_trecho = (colunas >= inicio) & (colunas < fim)
+
+        # Pertinência por máscara booleana: presente[f, cidade] indica se a
+        # cidade já veio do pai1 para o filho f
+        presente = np.zeros(pais1.shape, dtype=bool)
+        presente[np.nonzero(no_trecho)[0], pais1[no_trecho]] = True
+        restantes = ~presente[linhas, pais2]
+
+        filhos = np.empty_like(pais1)
+        filhos[no_trecho] = pais1[no_trecho]
+        # Cada linha tem tantas cidades restantes quanto posições livres, então
+        # a indexação booleana (em ordem de linha) casa uma com a outra
+        filhos[~no_trecho] = pais2[restantes]
+        return filhos
+
+    def _crossover_pmx_lote(self, pais1, pais2):
+        """
+        Crossover Parcialmente Mapeado (PMX) em lote. O trecho vem do pai1 e
+        as demais posições vêm do pai2; quando uma cidade do pai2 já está no
+        trecho, segue-se o mapeamento pai1 -> pai2 até achar uma cidade livre.
+        """
+        quantidade = len(pais1)
+        linhas = np.arange(quantidade)[:, None]
+        colunas = np.arange(self.num_cidades)[None, :]
+        inicio, fim = self._sortear_trechos(quantidade)
+        no_trecho = (colunas >= inicio) & (colunas < fim)
+
+        posicao_pai1 = np.empty_like(pais1)
+        posicao_pai1[linhas, pais1] = colunas
+
+        filhos = np.where(no_trecho, pais1, pais2)
+        # Cidades fora do trecho que colidem com o trecho do pai1
+        f, j = np.nonzero(~no_trecho & no_trecho[linhas, posicao_pai1[linhas, filhos]])
+        valores = filhos[f, j]
+        while len(f):
+            valores = pais2[f, posicao_pai1[f, valores]]
+            # Só as posições que ainda colidem seguem para a próxima rodada
+            resolvidas = ~no_trecho[f, posicao_pai1[f, valores]]
+            filhos[f[resolvidas], j[resolvidas]] = valores[resolvidas]
+            f, j, valores = f[~resolvidas], j[~resolvidas], valores[~resolvidas]
+        return filhos
+
+    def _delta_arestas(self, antigas, novas, arestas, validas):
+        """
+        Variação do comprimento de cada rota considerando só as arestas
+        indicadas: a aresta k liga as posições k e k+1 (circular). 'validas'
+        descarta índices repetidos, que apareceriam duas vezes na soma.
+        """
+        linhas = np.arange(len(antigas))[:, None]
+        seguintes = (arestas + 1) % self.num_cidades
+        antes = self._comprimentos(antigas[linhas, arestas], antigas[linhas, seguintes])
+        depois = self._comprimentos(novas[linhas, arestas], novas[linhas, seguintes])
+        return np.where(validas, depois - antes, 0.0).sum(axis=1)
+
+    def _mutacao_troca_lote(self, rotas):
+        """
+        Mutação de Troca em lote: troca duas cidades aleatórias de cada linha.
+        Retorna as novas rotas e a variação de comprimento de cada uma, obtida
+        em O(1) pelas (até) quatro arestas que tocam as posições trocadas.
+        """
+        n = self.num_cidades
+        linhas = np.arange(len(rotas))
+        inicio, fim = self._sortear_trechos(len(rotas))
+        pos1, pos2 = inicio[:, 0], fim[:, 0]
+        novas = rotas.copy()
+        novas[linhas, pos1], novas[linhas, pos2] = rotas[linhas, pos2], rotas[linhas, pos1]
+
+        arestas = np.stack([(pos1 - 1) % n, pos1, (pos2 - 1) % n, pos2], axis=1)
+        # Posições vizinhas compartilham uma aresta; ela só pode contar uma vez
+        validas = np.ones(arestas.shape, dtype=bool)
+        validas[:, 2] = arestas[:, 2] != arestas[:, 1]
+        validas[:, 3] = arestas[:, 3] != arestas[:, 0]
+        return novas, self._delta_arestas(rotas, novas, arestas, validas)
+
+    def _mutacao_inversao_lote(self, rotas):
         """
-        Executa a Mutação de Troca (Swap Mutation).
-        Seleciona duas cidades aleatórias na rota e troca suas posições.
+        Mutação de Inversão em lote: inverte um trecho aleatório de cada linha.
+        Como as distâncias são simétricas, só as duas arestas das pontas do
+        trecho mudam de comprimento.
         """
-        pos1, pos2 = random.sample(range(len(rota)), 2)
-        rota[pos1], rota[pos2] = rota[pos2], rota[pos1]
-        return rota
+        n = self.num_cidades
+        colunas = np.arange(n)[None, :]
+        inicio, fim = self._sortear_trechos(len(rotas), comprimento_minimo=2)
+        no_trecho = (colunas >= inicio) & (colunas < fim)
+        # Dentro do trecho, a posição j lê a posição espelhada inicio + fim - 1 - j
+        origem = np.where(no_trecho, inicio + fim - 1 - colunas, colunas)
+        novas = np.take_along_axis(rotas, origem, axis=1)
+
+        arestas = np.concatenate([(inicio - 1) % n, fim - 1], axis=1)
+        # Inverter a rota inteira não muda nenhuma aresta
+        validas = np.ones(arestas.shape, dtype=bool)
+        validas[:, 1] = arestas[:, 1] != arestas[:, 0]
+        return novas, self._delta_arestas(rotas, novas, arestas, validas)
+
+    def _mutacao_insercao_lote(self, rotas):
+        """
+        Mutação de Inserção em lote: retira uma cidade de cada linha e a
+        reinsere em outra posição. O delta é o custo de religar o ponto de
+        onde ela saiu mais o custo de encaixá-la entre os novos vizinhos.
+        """
+        n = self.num_cidades
+        linhas = np.arange(len(rotas))
+        colunas = np.arange(n)[None, :]
+        pos1, pos2 = np.random.randint(0, n, len(rotas)), np.random.randint(0, n - 1, len(rotas))
+        pos2 += pos2 >= pos1
+        origem_col, destino_col = pos1[:, None], pos2[:, None]
+        # Entre origem e destino, as cidades andam uma casa em direção à origem
+        avanca = (origem_col < destino_col) & (colunas >= origem_col) & (colunas < destino_col)
+        recua = (origem_col > destino_col) & (colunas > destino_col) & (colunas <= origem_col)
+        origem = colunas + avanca - recua.astype(int)
+        origem = np.where(colunas == destino_col, origem_col, origem)
+        novas = np.take_along_axis(rotas, origem, axis=1)
+
+        dist = self._comprimentos
+        cidade = rotas[linhas, pos1]
+        antes, depois = rotas[linhas, (pos1 - 1) % n], rotas[linhas, (pos1 + 1) % n]
+        novo_antes, novo_depois = novas[linhas, (pos2 - 1) % n], novas[linhas, (pos2 + 1) % n]
+        remocao = dist(antes, cidade) + dist(cidade, depois) - dist(antes, depois)
+        insercao = dist(novo_antes, cidade) + dist(cidade, novo_depois) - dist(novo_antes, novo_depois)
+        return novas, insercao - remocao
+
+    def _crossover_ordenado(self, pai1, pai2):
+        """Executa o Crossover Ordenado (OX1) para criar um único filho."""
+        return self._crossover_ox_lote(np.asarray(pai1)[None], np.asarray(pai2)[None])[0]
+
+    def _mutacao_troca(self, rota):
+        """Executa a Mutação de Troca (Swap Mutation) em uma única rota."""
+        return self._mutacao_troca_lote(np.asarray(rota)[None])[0][0]
 
     def evoluir_populacao(self):
         """
         Executa um ciclo completo de evolução:
         Avaliação -> Seleção -> Crossover -> Mutação.
         """
-        # 1. Avaliação: Calcula o fitness de cada indivíduo da população atual
-        fitness_populacao = {tuple(rota): self._calcular_fitness(rota) for rota in self.populacao}
+        # 1. Avaliação: só os indivíduos ainda sem distância são medidos
+        self._avaliar(self.populacao)
+        rotas = self.populacao.rotas
+        distancias = self.populacao.distancias
         
-        nova_populacao = []
+        # Mantém o melhor indivíduo da geração atual (elitismo), com sua distância
+        melhor = self.populacao.indice_melhor()
         
-        # Mantém o melhor indivíduo da geração atual (elitismo)
-        melhor_rota_atual = max(fitness_populacao, key=fitness_populacao.get)
-        nova_populacao.append(list(melhor_rota_atual))
+        # 2. Seleção: sorteia os dois pais de cada filho numa única chamada
+        num_filhos = self.tam_populacao - 1
+        pais = self._selecionar_pais(self.populacao, 2 * num_filhos).reshape(num_filhos, 2)
         
-        # 2. Gera o resto da nova população
-        while len(nova_populacao) < self.tam_populacao:
-            # 3. Seleção: Seleciona dois pais
-            pai1_tuple = self._selecao_torneio(fitness_populacao)
-            pai2_tuple = self._selecao_torneio(fitness_populacao)
-            pai1 = list(pai1_tuple)
-            pai2 = list(pai2_tuple)
-
-            filho = pai1 # Por padrão, o filho é uma cópia do pai1
-            
-            # 4. Crossover: Cruza os pais se a taxa de crossover for atingida
-            if random.random() < self.taxa_crossover:
-                filho = self._crossover_ordenado(pai1, pai2)
-            
-            # 5. Mutação: Aplica mutação no filho se a taxa de mutação for atingida
-            if random.random() < self.taxa_mutacao:
-                filho = self._mutacao_troca(filho)
-            
-            nova_populacao.append(filho)
+        # Por padrão, cada filho é uma cópia do pai1 e herda sua distância
+        filhos = rotas[pais[:, 0]].copy()
+        distancias_filhos = distancias[pais[:, 0]].copy()
         
-        self.populacao = nova_populacao
-
-    def encontrar_melhor_rota(self):
-        """Executa o algoritmo genético por N gerações e retorna a melhor rota encontrada."""
-        historico_distancias = []
+        # 3. Crossover: aplicado em lote aos filhos sorteados pela taxa de crossover
+        cruzar = np.random.random(num_filhos) < self.taxa_crossover
+        if cruzar.any():
+            filhos[cruzar] = self.operadores_crossover[self.operador_crossover](
+                filhos[cruzar], rotas[pais[cruzar, 1]])
+            distancias_filhos[cruzar] = np.nan
+        
+        # 4. Mutação: aplicada em lote aos filhos sorteados pela taxa de mutação.
+        # Filhos que só sofreram mutação têm a distância atualizada pelo delta
+        # (O(1)); os que vieram de crossover continuam sem distância (NaN).
+        mutar = np.random.random(num_filhos) < self.taxa_mutacao
+        if mutar.any():
+            filhos[mutar], deltas = self.operadores_mutacao[self.operador_mutacao](filhos[mutar])
+            distancias_filhos[mutar] += deltas
+            self.atualizacoes_delta += int(np.count_nonzero(mutar & ~cruzar))
         
+        nova_populacao = np.concatenate([rotas[melhor][None], filhos])
+        novas_distancias = np.concatenate([[distancias[melhor]], distancias_filhos])
+        self.populacao = Populacao(nova_populacao, novas_distancias)
+        
+        # 5. Busca local (opcional): refina só os filhos que mudaram
+        self._aplicar_busca_local(self.populacao, 1 + np.flatnonzero(cruzar | mutar))
+
+    def melhores_individuos(self, quantidade):
+        """Retorna cópias das 'quantidade' melhores rotas e suas distâncias."""
+        self._avaliar(self.populacao)
+        quantidade = min(quantidade, len(self.populacao))
+        indices = np.argsort(self.populacao.distancias)[:quantidade]
+        return self.populacao.rotas[indices].copy(), self.populacao.distancias[indices].copy()
+
+    def receber_migrantes(self, rotas, distancias):
+        """Substitui os piores indivíduos da população pelos migrantes recebidos."""
+        self._avaliar(self.populacao)
+        quantidade = min(len(rotas), len(self.populacao))
+        if quantidade == 0:
+            return
+        piores = np.argsort(self.populacao.distancias)[-quantidade:]
+        self.populacao.rotas[piores] = rotas[:quantidade]
+        self.populacao.distancias[piores] = distancias[:quantidade]
+
+    def encontrar_melhor_rota(self, ao_fim_da_geracao=None):
+        """
+        Executa o algoritmo genético até completar N gerações e retorna a
+        melhor rota encontrada. Um resolvedor restaurado de um checkpoint
+        continua da geração em que parou. 'ao_fim_da_geracao', se dado, é
+        chamado com o resolvedor depois de cada geração.
+        """
         print(f"Executando o Algoritmo Genético por {self.num_geracoes} gerações...")
+        inicio = time.perf_counter() - self.tempo_decorrido
         
-        for i in range(self.num_geracoes):
+        while self.geracao < self.num_geracoes:
             self.evoluir_populacao()
+            self.geracao += 1
             
-            # Encontra a melhor rota da geração atual para registro
-            fitness_atual = {tuple(rota): self._calcular_fitness(rota) for rota in self.populacao}
-            melhor_rota_geracao = max(fitness_atual, key=fitness_atual.get)
-            distancia_melhor = 1 / fitness_atual[melhor_rota_geracao]
-            historico_distancias.append(distancia_melhor)
+            # Avalia os novos indivíduos (uma única vez) e registra a melhor distância
+            self._avaliar(self.populacao)
+            distancia_melhor = float(self.populacao.distancias.min())
+            self.historico_distancias.append(distancia_melhor)
+            self.tempo_decorrido = time.perf_counter() - inicio
             
-            if (i + 1) % 10 == 0:
-                print(f"Geração {i+1:4d} | Melhor Distância: {distancia_melhor:.2f}")
+            if self.geracao % 10 == 0:
+                print(f"Geração {self.geracao:4d} | Melhor Distância: {distancia_melhor:.2f}")
+            if ao_fim_da_geracao is not None:
+                ao_fim_da_geracao(self)
 
-        # Ao final, encontra a melhor rota da última população
-        fitness_final = {tuple(rota): self._calcular_fitness(rota) for rota in self.populacao}
-        melhor_rota_final = max(fitness_final, key=fitness_final.get)
+        # Ao final, a melhor rota da última população já está avaliada
+        self._avaliar(self.populacao)
+        melhor = self.populacao.indice_melhor()
+        self.melhor_distancia = float(self.populacao.distancias[melhor])
         
-        return list(melhor_rota_final), historico_distancias
+        return [self.cidades[i] for i in self.populacao.rotas[melhor]], list(self.historico_distancias)
+
+    def salvar_checkpoint(self, caminho):
+        """
+        Grava população, distâncias, histórico, tempo decorrido e estado dos
+        geradores aleatórios em um .npz. A escrita é feita em um arquivo temporário e
+        renomeada, para que uma interrupção não corrompa o checkpoint anterior.
+        """
+        _, chave, posicao, tem_gauss, gauss = np.random.get_state()
+        temporario = caminho + ".tmp"
+        with open(temporario, "wb") as f:
+            np.savez(
+                f,
+                rotas=self.populacao.rotas,
+                distancias=self.populacao.distancias,
+                historico=np.array(self.historico_distancias, dtype=np.float64),
+                geracao=self.geracao,
+                tempo_decorrido=self.tempo_decorrido,
+                estado_numpy_chave=chave,
+                estado_numpy=np.array([posicao, tem_gauss], dtype=np.int64),
+                estado_numpy_gauss=gauss,
+                estado_random=json.dumps(random.getstate()),
+            )
+        os.replace(temporario, caminho)
+
+    def carregar_checkpoint(self, caminho):
+        """Restaura neste resolvedor o estado gravado por salvar_checkpoint()."""
+        with np.load(caminho) as dados:
+            rotas = dados["rotas"]
+            if rotas.shape[1] != self.num_cidades:
+                raise ValueError(f"Checkpoint com {rotas.shape[1]} cidades; a instância tem {self.num_cidades}.")
+            self.populacao = Populacao(rotas, dados["distancias"])
+            self.tam_populacao = len(rotas)
+            self.historico_distancias = dados["historico"].tolist()
+            self.geracao = int(dados["geracao"])
+            # Checkpoints antigos não guardavam o tempo
+            self.tempo_decorrido = float(dados["tempo_decorrido"]) if "tempo_decorrido" in dados else 0.0
+            posicao, tem_gauss = dados["estado_numpy"].tolist()
+            np.random.set_state(("MT19937", dados["estado_numpy_chave"], posicao, tem_gauss,
+                                 float(dados["estado_numpy_gauss"])))
+            versao, estado, gauss = json.loads(str(dados["estado_random"]))
+            random.setstate((versao, tuple(estado), gauss))
+
+def _processo_ilha(conexao, cidades, nome_memoria, parametros, num_migrantes, semente):
+    """
+    Laço de uma ilha, executado em um processo próprio.
+    A matriz de distâncias, se houver (nome_memoria não é None), é lida da
+    memória compartilhada (sem cópia).
+    Protocolo: recebe ("evoluir", geracoes, rotas_migrantes, distancias_migrantes)
+    e responde com (historico, rotas_emigrantes, distancias_emigrantes);
+    recebe ("fim",) e responde com (melhor_rota, melhor_distancia).
+    """
+    random.seed(semente)
+    np.random.seed(semente % 2**32)
+    memoria = matriz = None
+    try:
+        if nome_memoria is not None:
+            memoria = shared_memory.SharedMemory(name=nome_memoria)
+            num_cidades = len(cidades)
+            matriz = np.ndarray((num_cidades, num_cidades), dtype=np.float32, buffer=memoria.buf)
+        ag = ResolvedorTSP_AG(cidades, matriz_distancias=matriz, **parametros)
+        while True:
+            comando = conexao.recv()
+            if comando[0] == "fim":
+                rotas, distancias = ag.melhores_individuos(1)
+                conexao.send((rotas[0], float(distancias[0])))
+                break
+            _, geracoes, rotas_migrantes, distancias_migrantes = comando
+            if rotas_migrantes is not None:
+                ag.receber_migrantes(rotas_migrantes, distancias_migrantes)
+            historico = []
+            for _ in range(geracoes):
+                ag.evoluir_populacao()
+                ag._avaliar(ag.populacao)
+                historico.append(float(ag.populacao.distancias.min()))
+            conexao.send((historico,) + ag.melhores_individuos(num_migrantes))
+        # Solta a referência ao buffer antes de fechar o segmento
+        del ag, matriz
+    finally:
+        if memoria is not None:
+            memoria.close()
+        conexao.close()
+
+class ModeloIlhas:
+    """
+    Modelo de ilhas: várias populações evoluem em paralelo, cada uma em um
+    processo, e a cada 'intervalo_migracao' gerações os melhores indivíduos
+    de cada ilha migram para outra, numa topologia em anel ou aleatória.
+    A matriz de distâncias, quando usada, é criada uma única vez em memória
+    compartilhada.
+    """
+    TOPOLOGIAS = ("anel", "aleatoria")
+
+    def __init__(self, cidades, num_ilhas, tam_populacao, taxa_mutacao, taxa_crossover,
+                 num_geracoes, intervalo_migracao=10, num_migrantes=2, topologia="anel",
+                 semente=None, **parametros_ag):
+        if topologia not in self.TOPOLOGIAS:
+            raise ValueError(f"Topologia desconhecida: {topologia!r}")
+        self.cidades = cidades
+        self.num_ilhas = num_ilhas
+        self.num_geracoes = num_geracoes
+        self.intervalo_migracao = intervalo_migracao
+        self.topologia = topologia
+        self.semente = random.randrange(2**31) if semente is None else semente
+        self.parametros = dict(
+            tam_populacao=tam_populacao,
+            taxa_mutacao=taxa_mutacao,
+            taxa_crossover=taxa_crossover,
+            num_geracoes=num_geracoes,
+            **parametros_ag,
+        )
+        self.num_migrantes = num_migrantes
+        self.melhor_distancia = None
+        self.historico_por_ilha = []
+
+    def _destinos(self, rng):
+        """Para cada ilha de origem, a ilha que recebe seus migrantes."""
+        if self.num_ilhas < 2:
+            return list(range(self.num_ilhas))
+        if self.topologia == "anel":
+            return [(i + 1) % self.num_ilhas for i in range(self.num_ilhas)]
+        return [rng.choice([j for j in range(self.num_ilhas) if j != i]) for i in range(self.num_ilhas)]
+
+    def encontrar_melhor_rota(self):
+        """
+        Executa todas as ilhas e retorna a melhor rota global e o histórico
+        de convergência (melhor distância entre todas as ilhas a cada geração).
+        """
+        memoria = None
+        if _decidir_matriz(self.parametros.get("usar_matriz"), self.parametros.get("busca_local", False),
+                           self.parametros.get("num_sementes_heuristicas", 0)):
+            n = len(self.cidades)
+            memoria = shared_memory.SharedMemory(create=True, size=n * n * np.dtype(np.float32).itemsize)
+            calcular_matriz_distancias(self.cidades, saida=np.ndarray((n, n), dtype=np.float32, buffer=memoria.buf))
+        rng = random.Random(self.semente)
+
+        print(f"Executando o modelo de ilhas: {self.num_ilhas} ilhas x {self.num_geracoes} gerações...")
+        conexoes, processos = [], []
+        try:
+            for i in range(self.num_ilhas):
+                lado_pai, lado_filho = mp.Pipe()
+                processo = mp.Process(
+                    target=_processo_ilha,
+                    args=(lado_filho, self.cidades, memoria and memoria.name, self.parametros,
+                          self.num_migrantes, self.semente + i),
+                    daemon=True,
+                )
+                processo.start()
+                lado_filho.close()
+                conexoes.append(lado_pai)
+                processos.append(processo)
+
+            self.historico_por_ilha = [[] for _ in range(self.num_ilhas)]
+            migrantes = [(None, None)] * self.num_ilhas
+            geracao = 0
+            while geracao < self.num_geracoes:
+                geracoes = min(self.intervalo_migracao, self.num_geracoes - geracao)
+                for conexao, (rotas, distancias) in zip(conexoes, migrantes):
+                    conexao.send(("evoluir", geracoes, rotas, distancias))
+                respostas = [conexao.recv() for conexao in conexoes]
+                geracao += geracoes
+
+                # Migração: os melhores de cada ilha seguem para a ilha de destino
+                migrantes = [(None, None)] * self.num_ilhas
+                if self.num_ilhas > 1 and self.num_migrantes > 0:
+                    for origem, destino in enumerate(self._destinos(rng)):
+                        migrantes[destino] = respostas[origem][1:]
+                for i, (historico, _, _) in enumerate(respostas):
+                    self.historico_por_ilha[i].extend(historico)
+
+                melhor_atual = min(h[-1] for h in self.historico_por_ilha)
+                print(f"Geração {geracao:4d} | Melhor Distância: {melhor_atual:.2f}")
+
+            for conexao in conexoes:
+                conexao.send(("fim",))
+            finais = [conexao.recv() for conexao in conexoes]
+        finally:
+            for conexao in conexoes:
+                conexao.close()
+            for processo in processos:
+                processo.join(timeout=5)
+                if processo.is_alive():
+                    processo.terminate()
+            if memoria is not None:
+                memoria.close()
+                memoria.unlink()
+
+        historico_distancias = np.min(np.array(self.historico_por_ilha), axis=0).tolist()
+        melhor_rota, self.melhor_distancia = min(finais, key=lambda final: final[1])
+        return [self.cidades[i] for i in melhor_rota], historico_distancias
+
+def plotar_rota(cidades, rota, historico_distancias, arquivo=None):
+    """
+    Plota a melhor rota e o gráfico de convergência.
+    Com 'arquivo', salva a figura em vez de abrir a janela (uso headless).
+    """
+    # Importado só aqui: rodar o AG não exige matplotlib
+    import matplotlib
+    if arquivo is not None:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
 
-def plotar_rota(cidades, rota, historico_distancias):
-    """Plota a melhor rota e o gráfico de convergência."""
     plt.figure(figsize=(12, 6))
 
     # Gráfico 1: Rota
@@ -174,8 +1144,10 @@ def plotar_rota(cidades, rota, historico_distancias):
     y_rota = [cidade.y for cidade in rota] + [rota[0].y]
     plt.plot(x_rota, y_rota, 'o-')
     
-    for i, cidade in enumerate(cidades):
-        plt.text(cidade.x, cidade.y, f' {i}')
+    # Rótulos só são legíveis em instâncias pequenas
+    if len(cidades) <= 100:
+        for i, cidade in enumerate(cidades):
+            plt.text(cidade.x, cidade.y, f' {i}')
         
     plt.title("Melhor Rota Encontrada")
     plt.xlabel("Coordenada X")
@@ -189,33 +1161,177 @@ def plotar_rota(cidades, rota, historico_distancias):
     plt.ylabel("Melhor Distância")
 
     plt.tight_layout()
-    plt.show()
+    if arquivo is not None:
+        plt.savefig(arquivo)
+        plt.close()
+    else:
+        plt.show()
 
-if __name__ == "__main__":
+class RegistroGeracoes:
+    """
+    Grava uma linha por geração (geração, melhor distância, tempo decorrido)
+    em CSV ou JSONL, conforme a extensão do arquivo. Cada linha é descarregada
+    no disco na hora, para acompanhar execuções longas com 'tail -f'.
+
+    Ao retomar de um checkpoint, 'retomar_da_geracao' mantém só as linhas
+    até aquela geração: as gravadas depois do checkpoint serão refeitas e
+    apareceriam duplicadas.
+    """
+    CAMPOS = ("geracao", "melhor_distancia", "tempo_s")
+
+    def __init__(self, caminho, retomar_da_geracao=None):
+        self.jsonl = caminho.endswith((".jsonl", ".json"))
+        mantidas = []
+        if retomar_da_geracao is not None and os.path.exists(caminho):
+            mantidas = self._linhas_ate(caminho, retomar_da_geracao)
+        self.arquivo = open(caminho, "w", encoding="utf-8", newline="")
+        self.escritor = None if self.jsonl else csv.writer(self.arquivo)
+        if not self.jsonl:
+            self.escritor.writerow(self.CAMPOS)
+        self.arquivo.writelines(mantidas)
+        self.arquivo.flush()
+
+    def _linhas_ate(self, caminho, geracao):
+        """Linhas já gravadas (sem o cabeçalho do CSV) com geração <= 'geracao'."""
+        with open(caminho, encoding="utf-8", newline="") as f:
+            linhas = f.readlines()
+        if self.jsonl:
+            return [linha for linha in linhas if linha.strip() and json.loads(linha)["geracao"] <= geracao]
+        return [linha for linha in linhas[1:] if linha.strip() and int(linha.split(",", 1)[0]) <= geracao]
+
+    def registrar(self, geracao, melhor_distancia, tempo_s):
+        valores = (geracao, melhor_distancia, round(tempo_s, 3))
+        if self.jsonl:
+            self.arquivo.write(json.dumps(dict(zip(self.CAMPOS, valores))) + "\n")
+        else:
+            self.escritor.writerow(valores)
+        self.arquivo.flush()
+
+    def fechar(self):
+        self.arquivo.close()
+
+def main_cli(argv=None):
+    """CLI headless: roda o AG sobre uma instância TSPLIB ou aleatória."""
+    parser = argparse.ArgumentParser(description="Algoritmo Genético para o TSP (modo headless).")
+    parser.add_argument('--tsp', default=None, help="Instância TSPLIB (.tsp) com NODE_COORD_SECTION.")
+    parser.add_argument('--cidades', type=int, default=100,
+                        help="Número de cidades aleatórias, se --tsp não for dado.")
+    parser.add_argument('--populacao', type=int, default=100)
+    parser.add_argument('--geracoes', type=int, default=500)
+    parser.add_argument('--taxa-mutacao', type=float, default=0.05)
+    parser.add_argument('--taxa-crossover', type=float, default=0.9)
+    parser.add_argument('--selecao', choices=ResolvedorTSP_AG.METODOS_SELECAO, default='torneio')
+    parser.add_argument('--crossover', choices=('ox', 'pmx'), default='ox')
+    parser.add_argument('--mutacao', choices=('troca', 'inversao', 'insercao'), default='troca')
+    parser.add_argument('--busca-local', action='store_true', help="Ativa o estágio 2-opt/Or-opt.")
+    parser.add_argument('--sementes-heuristicas', type=int, default=0)
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--registro', default=None,
+                        help="Arquivo .csv ou .jsonl com a melhor distância de cada geração.")
+    parser.add_argument('--checkpoint', default=None, help="Arquivo .npz de checkpoint.")
+    parser.add_argument('--intervalo-checkpoint', type=int, default=50,
+                        help="Gerações entre gravações do checkpoint.")
+    parser.add_argument('--retomar', action='store_true',
+                        help="Continua a partir do checkpoint, se ele existir.")
+    parser.add_argument('--plotar', default=None, help="Salva a figura da rota neste arquivo (.png).")
+    args = parser.parse_args(argv)
+
+    random.seed(args.semente)
+    np.random.seed(args.semente)
+    if args.tsp:
+        coordenadas, cabecalho = carregar_tsplib(args.tsp)
+        print(f"Instância {cabecalho.get('NAME', args.tsp)}: {len(coordenadas)} cidades")
+    else:
+        coordenadas = np.random.random((args.cidades, 2)) * 1000
+    cidades = [Cidade(x, y) for x, y in coordenadas.tolist()]
+
+    # O checkpoint é carregado no lugar da população inicial, que nem é criada
+    retomando = bool(args.retomar and args.checkpoint and os.path.exists(args.checkpoint))
+    ag_tsp = ResolvedorTSP_AG(
+        cidades=cidades,
+        tam_populacao=args.populacao,
+        taxa_mutacao=args.taxa_mutacao,
+        taxa_crossover=args.taxa_crossover,
+        num_geracoes=args.geracoes,
+        metodo_selecao=args.selecao,
+        operador_crossover=args.crossover,
+        operador_mutacao=args.mutacao,
+        busca_local=args.busca_local,
+        num_sementes_heuristicas=args.sementes_heuristicas,
+        checkpoint=args.checkpoint if retomando else None,
+    )
+    if retomando:
+        print(f"Retomando da geração {ag_tsp.geracao} ('{args.checkpoint}')")
+
+    registro = None
+    if args.registro:
+        registro = RegistroGeracoes(args.registro, retomar_da_geracao=ag_tsp.geracao if retomando else None)
+
+    def ao_fim_da_geracao(ag):
+        if registro is not None:
+            registro.registrar(ag.geracao, ag.historico_distancias[-1], ag.tempo_decorrido)
+        if args.checkpoint and (ag.geracao % args.intervalo_checkpoint == 0
+                                or ag.geracao == ag.num_geracoes):
+            ag.salvar_checkpoint(args.checkpoint)
+
+    try:
+        melhor_rota, historico = ag_tsp.encontrar_melhor_rota(ao_fim_da_geracao)
+    finally:
+        if registro is not None:
+            registro.fechar()
+
+    print(f"Melhor distância encontrada: {ag_tsp.melhor_distancia:.2f}")
+    if args.plotar:
+        plotar_rota(cidades, melhor_rota, historico, arquivo=args.plotar)
+        print(f"Figura salva em '{args.plotar}'")
+
+def main():
+    """Demonstração com cidades aleatórias, exibindo a rota e a convergência."""
     # --- Parâmetros ---
     NUM_CIDADES = 20
     TAM_POPULACAO = 100
     TAXA_MUTACAO = 0.01
     TAXA_CROSSOVER = 0.9
     NUM_GERACOES = 100
+    NUM_ILHAS = 1  # Com mais de uma ilha, usa o modelo de ilhas em paralelo
 
     cidades = [Cidade(random.randint(0, 200), random.randint(0, 200)) for _ in range(NUM_CIDADES)]
 
     # Instancia e executa o resolvedor
-    ag_tsp = ResolvedorTSP_AG(
-        cidades=cidades,
-        tam_populacao=TAM_POPULACAO,
-        taxa_mutacao=TAXA_MUTACAO,
-        taxa_crossover=TAXA_CROSSOVER,
-        num_geracoes=NUM_GERACOES
-    )
+    if NUM_ILHAS > 1:
+        ag_tsp = ModeloIlhas(
+            cidades=cidades,
+            num_ilhas=NUM_ILHAS,
+            tam_populacao=TAM_POPULACAO,
+            taxa_mutacao=TAXA_MUTACAO,
+            taxa_crossover=TAXA_CROSSOVER,
+            num_geracoes=NUM_GERACOES
+        )
+    else:
+        ag_tsp = ResolvedorTSP_AG(
+            cidades=cidades,
+            tam_populacao=TAM_POPULACAO,
+            taxa_mutacao=TAXA_MUTACAO,
+            taxa_crossover=TAXA_CROSSOVER,
+            num_geracoes=NUM_GERACOES
+        )
     
     melhor_rota, historico = ag_tsp.encontrar_melhor_rota()
     
-    melhor_distancia = 1 / ag_tsp._calcular_fitness(melhor_rota)
+    melhor_distancia = ag_tsp.melhor_distancia
     print("\n" + "="*50)
     print("      RESULTADO FINAL DO ALGORITMO GENÉTICO      ")
     print("="*50)
     print(f"Melhor distância encontrada: {melhor_distancia:.2f}")
     
     plotar_rota(cidades, melhor_rota, historico)
+
+if __name__ == "__main__":
+    import sys
+    # Sem argumentos: demonstração com cidades aleatórias e gráfico.
+    # Com argumentos: CLI headless. Ex.:
+    # python3 algoritmo_genetico.py --tsp berlin52.tsp --registro log.csv --checkpoint ag.npz --retomar
+    if len(sys.argv) > 1:
+        main_cli()
+    else:
+        main()
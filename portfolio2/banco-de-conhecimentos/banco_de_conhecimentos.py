@@ -1,28 +1,78 @@
+import argparse
+import heapq
+import json
+import logging
+import os
 import random
+import sys
+import time
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Mensagens de turno do agente. Desligadas por padrão (NullHandler); o modo
+# interativo liga o nível DEBUG, e o simulador em lote as mantém caladas.
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
 class MundoWumpus:
     """
     Representa o AMBIENTE (o mundo real) que está oculto do agente.
+
+    As percepções não dependem do agente, então são pré-calculadas uma vez,
+    na criação do mundo, como grades NumPy (fedor, brisa, brilho) obtidas
+    deslocando as grades de perigos para os quatro vizinhos. Perceber e
+    verificar morte viram um único acesso a array.
     """
-    def __init__(self, tamanho=4):
+    def __init__(self, tamanho=4, num_pocos=3):
         self.tamanho = tamanho
-        self.wumpus = self._posicao_aleatoria()
-        self.ouro = self._posicao_aleatoria(evitar=[self.wumpus])
-        # Cria 3 poços
-        self.pocos = [self._posicao_aleatoria(evitar=[self.wumpus, self.ouro]) for _ in range(3)]
-        
-        # O agente sempre começa em (0, 0)
-        if (0, 0) in self.pocos:
-            self.pocos.remove((0, 0))
-        if self.wumpus == (0, 0):
-            self.wumpus = self._posicao_aleatoria(evitar=[(0,0), self.ouro] + self.pocos)
-        
-    def _posicao_aleatoria(self, evitar=None):
-        if evitar is None: evitar = []
-        while True:
-            pos = (random.randint(0, self.tamanho - 1), random.randint(0, self.tamanho - 1))
-            if pos not in evitar:
-                return pos
+        num_casas = tamanho * tamanho
+        if num_pocos + 1 > num_casas - 1:
+            raise ValueError("Poços e Wumpus não cabem no mundo (a casa (0, 0) fica livre).")
+
+        # Wumpus e poços em casas distintas, sorteadas sem reposição,
+        # nunca na casa inicial (0, 0) (id 0).
+        sorteio = random.sample(range(1, num_casas), num_pocos + 1)
+        self.wumpus = divmod(sorteio[0], tamanho)
+        self.pocos = [divmod(i, tamanho) for i in sorteio[1:]]
+        # Ouro numa casa livre qualquer (a inicial inclusive): sorteia o
+        # k-ésimo id livre e o converte em id real pulando os ocupados.
+        livre = random.randrange(num_casas - len(sorteio))
+        for ocupada in sorted(sorteio):
+            if ocupada > livre:
+                break
+            livre += 1
+        self.ouro = divmod(livre, tamanho)
+
+        self._construir_grades()
+
+    @staticmethod
+    def _vizinhanca(grade):
+        """Marca todas as casas adjacentes (4-vizinhança) a alguma casa True de 'grade'."""
+        resultado = np.zeros_like(grade)
+        resultado[1:, :] |= grade[:-1, :]
+        resultado[:-1, :] |= grade[1:, :]
+        resultado[:, 1:] |= grade[:, :-1]
+        resultado[:, :-1] |= grade[:, 1:]
+        return resultado
+
+    def _construir_grades(self):
+        t = self.tamanho
+        grade_wumpus = np.zeros((t, t), dtype=bool)
+        grade_wumpus[self.wumpus] = True
+        grade_pocos = np.zeros((t, t), dtype=bool)
+        if self.pocos:
+            linhas, colunas = zip(*self.pocos)
+            grade_pocos[list(linhas), list(colunas)] = True
+        grade_ouro = np.zeros((t, t), dtype=bool)
+        grade_ouro[self.ouro] = True
+
+        # percepcoes[r, c] = (fedor, brisa, brilho)
+        self.grade_percepcoes = np.stack(
+            [self._vizinhanca(grade_wumpus), self._vizinhanca(grade_pocos), grade_ouro], axis=-1
+        )
+        self.grade_morte = grade_wumpus | grade_pocos
 
     def _obter_adjacentes(self, pos):
         """Retorna os vizinhos válidos de uma posição."""
@@ -31,25 +81,159 @@ class MundoWumpus:
         return [(nr, nc) for nr, nc in candidatos if 0 <= nr < self.tamanho and 0 <= nc < self.tamanho]
 
     def obter_percepcoes(self, pos):
-        """Retorna as percepções do agente na posição (pos)."""
-        fedor = False
-        brisa = False
-        brilho = False
-
-        if pos == self.ouro:
-            brilho = True
-
-        for adj in self._obter_adjacentes(pos):
-            if adj == self.wumpus:
-                fedor = True
-            if adj in self.pocos:
-                brisa = True
-                
-        return (fedor, brisa, brilho)
+        """Retorna as percepções do agente na posição (pos): (fedor, brisa, brilho)."""
+        return tuple(self.grade_percepcoes[pos].tolist())
         
     def verificar_morte(self, pos):
         """Verifica se o agente morreu ao entrar nesta casa."""
-        return pos == self.wumpus or pos in self.pocos
+        return bool(self.grade_morte[pos])
+
+class FronteiraOrdenada:
+    """
+    Pilha de casas a explorar com teste de pertinência O(1).
+    Usa um dicionário (que preserva a ordem de inserção) como conjunto
+    ordenado: o topo da pilha é a última chave inserida.
+    """
+    def __init__(self):
+        self._casas = {}
+
+    def append(self, pos):
+        self._casas.setdefault(pos, None)
+
+    def pop(self):
+        return self._casas.popitem()[0]
+
+    def remove(self, pos):
+        del self._casas[pos]
+
+    def __contains__(self, pos):
+        return pos in self._casas
+
+    def __iter__(self):
+        return iter(self._casas)
+
+    def __len__(self):
+        return len(self._casas)
+
+class PlanejadorCaminhos:
+    """
+    Caminhos mais curtos (BFS) passando apenas por casas já visitadas,
+    que são comprovadamente seguras.
+
+    O mapa de distâncias a partir de cada origem fica em cache (LRU, com
+    até 'max_mapas' origens). A BFS é preguiçosa: o mapa é expandido só até
+    onde a consulta precisa, então achar a casa da fronteira mais próxima
+    costuma custar poucos nós.
+
+    Uma casa segura nova só invalida os mapas em que ela é vizinha de uma
+    casa já expandida: se só toca casas ainda na fila (ou nenhuma casa do
+    mapa), a BFS a encontrará normalmente quando chegar lá. A verificação é
+    preguiçosa: as casas novas vão para um registro e cada mapa confere só
+    as adicionadas desde a última vez em que foi usado.
+    """
+    def __init__(self, tamanho, max_mapas=4):
+        self.tamanho = tamanho
+        self.seguras = set()
+        self.max_mapas = max_mapas
+        self._cache = OrderedDict()
+        self._adicionadas = []  # Casas seguras, na ordem em que foram adicionadas
+
+    def _obter_adjacentes(self, pos):
+        r, c = pos
+        candidatos = [(r-1, c), (r+1, c), (r, c-1), (r, c+1)]
+        return [(nr, nc) for nr, nc in candidatos if 0 <= nr < self.tamanho and 0 <= nc < self.tamanho]
+
+    def adicionar_casa_segura(self, pos):
+        if pos not in self.seguras:
+            self.seguras.add(pos)
+            self._adicionadas.append(pos)
+
+    def _ainda_valido(self, mapa):
+        """O mapa continua correto se nenhuma casa nova é vizinha de uma casa já expandida."""
+        expandidas = mapa['expandidas']
+        for pos in self._adicionadas[mapa['versao']:]:
+            for viz in self._obter_adjacentes(pos):
+                if viz in expandidas:
+                    return False
+        mapa['versao'] = len(self._adicionadas)
+        return True
+
+    def _mapa(self, origem):
+        """Estado da BFS a partir de 'origem': distancia, pai, ordem de visita, fila pendente e casas já expandidas."""
+        mapa = self._cache.get(origem)
+        if mapa is not None and mapa['versao'] < len(self._adicionadas) and not self._ainda_valido(mapa):
+            mapa = None
+        if mapa is None:
+            mapa = {'distancia': {origem: 0}, 'pai': {origem: None},
+                    'ordem': [origem], 'fila': deque([origem]),
+                    'expandidas': set(), 'versao': len(self._adicionadas)}
+            self._cache[origem] = mapa
+            self._cache.move_to_end(origem)
+            if len(self._cache) > self.max_mapas:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(origem)
+        return mapa
+
+    def _percorrer(self, origem):
+        """Gera as casas seguras em ordem de distância, expandindo o mapa só quando necessário."""
+        mapa = self._mapa(origem)
+        distancia, pai, ordem, fila = mapa['distancia'], mapa['pai'], mapa['ordem'], mapa['fila']
+        expandidas = mapa['expandidas']
+        i = 0
+        while True:
+            if i < len(ordem):
+                yield ordem[i]
+                i += 1
+                continue
+            if not fila:
+                return
+            atual = fila.popleft()
+            expandidas.add(atual)
+            for viz in self._obter_adjacentes(atual):
+                if viz in self.seguras and viz not in distancia:
+                    distancia[viz] = distancia[atual] + 1
+                    pai[viz] = atual
+                    ordem.append(viz)
+                    fila.append(viz)
+
+    def mais_proxima(self, origem, alvos):
+        """
+        Casa de 'alvos' mais próxima de 'origem', chegando a ela por casas
+        seguras (os alvos são casas vizinhas da região visitada).
+        Retorna None se nenhuma for alcançável.
+        """
+        if origem in alvos:
+            return origem
+        for casa in self._percorrer(origem):
+            for viz in self._obter_adjacentes(casa):
+                if viz in alvos:
+                    return viz
+        return None
+
+    def caminho(self, origem, destino):
+        """Lista de casas de 'origem' até 'destino' (inclusive), ou None."""
+        mapa = self._mapa(origem)
+        alvo_seguro = destino if destino in self.seguras else None
+        sufixo = [] if alvo_seguro else [destino]
+        for casa in self._percorrer(origem):
+            if alvo_seguro is None and destino in self._obter_adjacentes(casa):
+                alvo_seguro = casa
+            if casa == alvo_seguro:
+                break
+        else:
+            return None
+        caminho = []
+        atual = alvo_seguro
+        while atual is not None:
+            caminho.append(atual)
+            atual = mapa['pai'][atual]
+        return caminho[::-1] + sufixo
+
+    def distancia(self, origem, destino):
+        """Número de movimentos de 'origem' até 'destino' (math.inf se inalcançável)."""
+        caminho = self.caminho(origem, destino)
+        return len(caminho) - 1 if caminho is not None else float('inf')
 
 class AgenteLogico:
     """
@@ -57,19 +241,45 @@ class AgenteLogico:
     """
     def __init__(self, tamanho):
         self.tamanho = tamanho
+        self.posicao_atual = (0, 0)
+        self.tem_ouro = False
+        # A fronteira guarda as casas que o agente sabe que são seguras e que
+        # ele pretende visitar; a próxima é a mais próxima em movimentos reais.
+        self.fronteira_segura = FronteiraOrdenada()
+        # Planejador de rotas pelas casas visitadas e custo real de movimentação
+        self.planejador = PlanejadorCaminhos(tamanho)
+        self.movimentos = 0
+        # Tempo gasto em TELL (_inferir) e ASK (escolher_proxima_acao), em segundos
+        self.tempo_inferencia = 0.0
+        self._iniciar_kb()
+
+    def _iniciar_kb(self):
+        """Cria a Base de Conhecimento vazia, com o conhecimento inicial."""
         # A Base de Conhecimento (KB) armazena fatos conhecidos.
         # Fatos são strings: "-P(1,2)" (Sem Poço), "W(2,3)" (Wumpus), "OK(1,1)" (Segura)
         self.kb = set()
         self.visitados = set()
-        self.posicao_atual = (0, 0)
-        self.tem_ouro = False
-        # A fronteira é uma pilha (LIFO) de casas que o agente sabe que são seguras
-        # e que ele pretende visitar.
-        self.fronteira_segura = []
         
         # Conhecimento inicial: (0,0) é seguro.
         self._adicionar_facto_kb(f"OK(0,0)")
 
+    def _marcar_visitada(self, pos):
+        """Registra que o agente esteve em 'pos'."""
+        self.visitados.add(pos)
+
+    def _eh_segura(self, pos):
+        """ASK: a KB garante que 'pos' é segura?"""
+        return f"OK({pos[0]},{pos[1]})" in self.kb
+
+    def _foi_visitada(self, pos):
+        """ASK: o agente já esteve em 'pos'?"""
+        return pos in self.visitados
+
+    def _vizinhos_a_explorar(self, pos):
+        """ASK: vizinhos de 'pos' que a KB garante seguros e que ainda não foram visitados."""
+        return [a for a in self._obter_adjacentes(pos)
+                if self._eh_segura(a) and not self._foi_visitada(a)]
+
     def _adicionar_facto_kb(self, facto):
         """Adiciona um fato à Base de Conhecimento e imprime (TELL)."""
         if facto not in self.kb:
@@ -94,21 +304,21 @@ class AgenteLogico:
         # Se não há fedor e não há brisa, todas as casas adjacentes
         # são seguras (sem Wumpus e sem Poços).
         if not fedor and not brisa:
-            print(f"  [Inferência] Posição {pos} é limpa. Inferindo que vizinhos são seguros.")
+            logger.debug("  [Inferência] Posição %s é limpa. Inferindo que vizinhos são seguros.", pos)
             for (r, c) in adjacentes:
                 self._adicionar_facto_kb(f"-P({r},{c})") # Não é Poço
                 self._adicionar_facto_kb(f"-W({r},{c})") # Não é Wumpus
                 
         # --- Regra 2: Inferência sobre Poços (Simples) ---
         if brisa:
-            print(f"  [Inferência] Sentiu BRISA em {pos}. Um vizinho tem um poço.")
+            logger.debug("  [Inferência] Sentiu BRISA em %s. Um vizinho tem um poço.", pos)
         else: # Se não sentiu brisa, todos os vizinhos NÃO têm poços.
             for (r, c) in adjacentes:
                 self._adicionar_facto_kb(f"-P({r},{c})")
 
         # --- Regra 3: Inferência sobre Wumpus (Simples) ---
         if fedor:
-            print(f"  [Inferência] Sentiu FEDOR em {pos}. Um vizinho tem o Wumpus.")
+            logger.debug("  [Inferência] Sentiu FEDOR em %s. Um vizinho tem o Wumpus.", pos)
         else: # Se não sentiu fedor, todos os vizinhos NÃO têm o Wumpus.
             for (r, c) in adjacentes:
                 self._adicionar_facto_kb(f"-W({r},{c})")
@@ -130,15 +340,19 @@ class AgenteLogico:
             return "SAIR"
             
         # 1. Adiciona vizinhos recém-descobertos e seguros à fronteira
-        for (r, c) in self._obter_adjacentes(self.posicao_atual):
-            if f"OK({r},{c})" in self.kb and (r, c) not in self.visitados:
-                if (r, c) not in self.fronteira_segura:
-                    print(f"  [Decisão] Casa ({r},{c}) é segura e será explorada.")
-                    self.fronteira_segura.append((r, c))
+        for (r, c) in self._vizinhos_a_explorar(self.posicao_atual):
+            if (r, c) not in self.fronteira_segura:
+                logger.debug("  [Decisão] Casa (%d,%d) é segura e será explorada.", r, c)
+                self.fronteira_segura.append((r, c))
 
-        # 2. Pega a próxima casa segura da fronteira (estilo DFS/Pilha)
+        # 2. Pega a casa segura da fronteira mais próxima (em movimentos reais)
         if self.fronteira_segura:
-            proxima_pos = self.fronteira_segura.pop()
+            proxima_pos = self.planejador.mais_proxima(self.posicao_atual, self.fronteira_segura)
+            if proxima_pos is None:
+                # Nenhuma casa da fronteira é alcançável por casas seguras
+                logger.debug("  [Decisão] Fronteira inalcançável a partir de %s.", self.posicao_atual)
+                return "DESISTIR"
+            self.fronteira_segura.remove(proxima_pos)
             return ("MOVER", proxima_pos)
         else:
             # Se a fronteira está vazia e não achamos o ouro, o agente está preso.
@@ -147,49 +361,913 @@ class AgenteLogico:
     def executar_passo(self, mundo):
         """Executa um ciclo completo de Percepção-Inferência-Ação."""
         
-        print(f"\n--- Turno do Agente ---")
-        print(f"Agente está em {self.posicao_atual}")
-        self.visitados.add(self.posicao_atual)
+        logger.info("\n--- Turno do Agente ---")
+        logger.info("Agente está em %s", self.posicao_atual)
+        self._marcar_visitada(self.posicao_atual)
+        self.planejador.adicionar_casa_segura(self.posicao_atual)
 
         # 1. PERCEBER o ambiente
         percepcoes = mundo.obter_percepcoes(self.posicao_atual)
         fedor, brisa, brilho = percepcoes
-        print(f"Agente percebe: Fedor={fedor}, Brisa={brisa}, Brilho={brilho}")
+        logger.info("Agente percebe: Fedor=%s, Brisa=%s, Brilho=%s", fedor, brisa, brilho)
         
         # 2. ATUALIZAR KB E INFERIR (TELL)
+        inicio = time.perf_counter()
         self._inferir(self.posicao_atual, percepcoes)
+        self.tempo_inferencia += time.perf_counter() - inicio
 
         # 3. VERIFICAR BRILHO (objetivo)
         if brilho:
             self.tem_ouro = True
-            print(f"  [Ação] Pegou o Ouro em {self.posicao_atual}!")
+            logger.info("  [Ação] Pegou o Ouro em %s!", self.posicao_atual)
             # Em um agente real, ele traçaria o caminho de volta para (0,0).
             # Vamos simplificar e apenas sair.
             return "VITORIA"
 
         # 4. ESCOLHER AÇÃO (ASK)
+        inicio = time.perf_counter()
         acao = self.escolher_proxima_acao()
+        self.tempo_inferencia += time.perf_counter() - inicio
         
         if acao == "DESISTIR":
-            print(f"  [Ação] Agente está preso e não há mais casas seguras. Desistindo.")
+            logger.info("  [Ação] Agente está preso e não há mais casas seguras. Desistindo.")
             return "DERROTA"
         elif acao == "VITORIA":
             return "VITORIA"
         
         elif acao[0] == "MOVER":
+            # Caminha pelas casas já visitadas até o destino
+            caminho = self.planejador.caminho(self.posicao_atual, acao[1])
+            if caminho is None:
+                logger.info("  [Ação] Não há caminho seguro até %s. Desistindo.", acao[1])
+                return "DERROTA"
+            self.movimentos += len(caminho) - 1
+            if len(caminho) > 2:
+                logger.info("  [Ação] Agente volta pelo caminho %s", caminho[1:-1])
             self.posicao_atual = acao[1]
-            print(f"  [Ação] Agente move-se para {self.posicao_atual}")
+            logger.info("  [Ação] Agente move-se para %s", self.posicao_atual)
             # Verifica se a inferência estava errada (o que não deve acontecer)
             # ou se ele foi para uma casa que *pensava* ser segura.
             if mundo.verificar_morte(self.posicao_atual):
-                print(f"  [MORTE] Agente entrou em {self.posicao_atual} e morreu.")
-                if self.posicao_atual == mundo.wumpus: print("Foi pego pelo Wumpus!")
-                if self.posicao_atual in mundo.pocos: print("Caiu em um poço!")
+                logger.info("  [MORTE] Agente entrou em %s e morreu.", self.posicao_atual)
+                if self.posicao_atual == mundo.wumpus: logger.info("Foi pego pelo Wumpus!")
+                if self.posicao_atual in mundo.pocos: logger.info("Caiu em um poço!")
                 return "DERROTA"
         
         return "CONTINUAR"
 
-if __name__ == "__main__":
+class BaseConhecimentoBits:
+    """
+    Base de Conhecimento estruturada, para mundos grandes.
+
+    Em vez de strings como "-P(1,2)", cada casa tem um byte de fatos em um
+    bytearray indexado pelo id da casa (linha * tamanho + coluna), com um
+    bit por predicado: SEM_POCO (-P), SEM_WUMPUS (-W), SEGURA (OK) e
+    VISITADA. TELL e ASK sobre a vizinhança são operações de máscara sobre
+    no máximo quatro bytes, sem montar nem hashear strings e sem o custo
+    fixo de uma chamada NumPy por passo.
+    """
+    SEM_POCO = 1
+    SEM_WUMPUS = 2
+    SEGURA = 4
+    VISITADA = 8
+    SEM_PERIGO = SEM_POCO | SEM_WUMPUS
+
+    def __init__(self, tamanho):
+        self.tamanho = tamanho
+        self.fatos = bytearray(tamanho * tamanho)
+
+    def id_casa(self, pos):
+        """Converte (linha, coluna) no índice da casa."""
+        return pos[0] * self.tamanho + pos[1]
+
+    def vizinhos(self, pos):
+        """Ids das casas adjacentes válidas (mesma ordem de _obter_adjacentes)."""
+        r, c = pos
+        t = self.tamanho
+        base = r * t + c
+        ids = []
+        if r > 0: ids.append(base - t)
+        if r < t - 1: ids.append(base + t)
+        if c > 0: ids.append(base - 1)
+        if c < t - 1: ids.append(base + 1)
+        return ids
+
+    def tem(self, pos, mascara):
+        """ASK: todos os predicados de 'mascara' valem em 'pos'?"""
+        return self.fatos[pos[0] * self.tamanho + pos[1]] & mascara == mascara
+
+    def marcar(self, pos, mascara):
+        """TELL: acrescenta os predicados de 'mascara' à casa 'pos'."""
+        self.fatos[pos[0] * self.tamanho + pos[1]] |= mascara
+
+    def marcar_vizinhos(self, pos, sem_poco, sem_wumpus):
+        """TELL: marca de uma vez todos os vizinhos de 'pos' como sem poço e/ou sem Wumpus
+        e atualiza o predicado OK (segura = sem_poco E sem_wumpus) deles."""
+        mascara = (self.SEM_POCO if sem_poco else 0) | (self.SEM_WUMPUS if sem_wumpus else 0)
+        fatos = self.fatos
+        for i in self.vizinhos(pos):
+            f = fatos[i] | mascara
+            if f & self.SEM_PERIGO == self.SEM_PERIGO:
+                f |= self.SEGURA
+            fatos[i] = f
+
+    def vizinhos_a_explorar(self, pos):
+        """ASK: vizinhos de 'pos' seguros e ainda não visitados, na ordem de vizinhos()."""
+        fatos = self.fatos
+        t = self.tamanho
+        return [divmod(i, t) for i in self.vizinhos(pos)
+                if fatos[i] & (self.SEGURA | self.VISITADA) == self.SEGURA]
+
+class AgenteLogicoBits(AgenteLogico):
+    """
+    Agente lógico com a mesma estratégia do AgenteLogico, mas usando a
+    BaseConhecimentoBits. As decisões são idênticas; muda só o custo de
+    TELL/ASK, que deixa de depender de formatação de strings.
+    """
+    def _iniciar_kb(self):
+        self.kb = BaseConhecimentoBits(self.tamanho)
+        self.kb.marcar((0, 0), BaseConhecimentoBits.SEGURA)
+
+    @property
+    def visitados(self):
+        """Conjunto das casas visitadas (montado sob demanda, para relatórios)."""
+        t = self.tamanho
+        fatos = np.frombuffer(self.kb.fatos, dtype=np.uint8)
+        return {divmod(int(i), t) for i in np.flatnonzero(fatos & BaseConhecimentoBits.VISITADA)}
+
+    def _marcar_visitada(self, pos):
+        self.kb.marcar(pos, BaseConhecimentoBits.VISITADA)
+
+    def _eh_segura(self, pos):
+        return self.kb.tem(pos, BaseConhecimentoBits.SEGURA)
+
+    def _foi_visitada(self, pos):
+        return self.kb.tem(pos, BaseConhecimentoBits.VISITADA)
+
+    def _vizinhos_a_explorar(self, pos):
+        return self.kb.vizinhos_a_explorar(pos)
+
+    def _inferir(self, pos, percepcoes):
+        """Mesmas regras do AgenteLogico, aplicadas à vizinhança inteira de uma vez."""
+        fedor, brisa, brilho = percepcoes
+
+        # Regra 1: sem fedor e sem brisa -> vizinhos seguros
+        if not fedor and not brisa:
+            logger.debug("  [Inferência] Posição %s é limpa. Inferindo que vizinhos são seguros.", pos)
+        if brisa:
+            logger.debug("  [Inferência] Sentiu BRISA em %s. Um vizinho tem um poço.", pos)
+        if fedor:
+            logger.debug("  [Inferência] Sentiu FEDOR em %s. Um vizinho tem o Wumpus.", pos)
+
+        # Regras 2 e 3 (e, por consequência, a 1) e a Regra 4 (OK) numa só atualização
+        self.kb.marcar_vizinhos(pos, sem_poco=not brisa, sem_wumpus=not fedor)
+
+class ResolvedorSAT:
+    """
+    Resolvedor SAT incremental no estilo CDCL.
+
+    - Literais são inteiros não nulos (v é a variável v verdadeira, -v falsa).
+    - Propagação unitária com dois literais vigiados por cláusula.
+    - Conflitos geram cláusulas aprendidas (esquema 1-UIP) com retrocesso
+      não cronológico.
+    - Cláusulas podem ser adicionadas entre chamadas; as atribuições de
+      nível 0 (fatos) e as cláusulas aprendidas continuam valendo, então
+      cada consulta só trabalha sobre as variáveis ainda indeterminadas.
+    - resolver(suposicoes) testa a satisfatibilidade sob suposições, que é
+      como a KB responde às perguntas de consequência lógica (ASK).
+    - Decisões seguem a heurística VSIDS: as variáveis livres ficam em um
+      heap por atividade (incrementada nas variáveis dos conflitos), então
+      escolher a próxima decisão não percorre todas as variáveis.
+    - resolver(suposicoes, variaveis) decide só as 'variaveis' informadas;
+      o heap é montado só com elas, então a consulta custa o tamanho desse
+      conjunto, e não o da KB inteira.
+    """
+    def __init__(self):
+        self.clausulas = []
+        self.vigias = defaultdict(list)  # literal -> cláusulas que o vigiam
+        self.valor = {}                  # variável -> bool
+        self.nivel = {}                  # variável -> nível de decisão
+        self.razao = {}                  # variável -> cláusula que a implicou (ou None)
+        self.trilha = []                 # literais atribuídos, em ordem
+        self.inicio_nivel = []           # posição na trilha onde cada nível começa
+        self.cabeca_propagacao = 0
+        self.variaveis = set()
+        self.inconsistente = False
+        self.atividade = {}              # variável -> atividade VSIDS
+        self.incremento_atividade = 1.0
+        self._heap = []                  # (-atividade, variável), com entradas obsoletas
+        self._no_heap = {}               # variável -> atividade da sua entrada válida no heap
+        self._decidiveis = None          # Variáveis que a consulta atual pode decidir (None = todas)
+
+    def _valor_literal(self, lit):
+        v = self.valor.get(abs(lit))
+        if v is None:
+            return None
+        return v if lit > 0 else not v
+
+    def _atribuir(self, lit, razao):
+        var = abs(lit)
+        self.valor[var] = lit > 0
+        self.nivel[var] = len(self.inicio_nivel)
+        self.razao[var] = razao
+        self.trilha.append(lit)
+
+    def _inserir_heap(self, var):
+        if self._decidiveis is not None and var not in self._decidiveis:
+            return
+        atividade = self.atividade.setdefault(var, 0.0)
+        if self._no_heap.get(var) != atividade:
+            self._no_heap[var] = atividade
+            heapq.heappush(self._heap, (-atividade, var))
+
+    def _proxima_livre(self):
+        """Variável livre de maior atividade, ou None (descarta entradas obsoletas)."""
+        while self._heap:
+            atividade, var = heapq.heappop(self._heap)
+            if self._no_heap.get(var) != -atividade:
+                continue
+            del self._no_heap[var]
+            if var not in self.valor:
+                return var
+            # Atribuída: volta ao heap quando for desfeita em _retroceder
+        return None
+
+    def _aumentar_atividade(self, var):
+        self.atividade[var] += self.incremento_atividade
+        if self.atividade[var] > 1e100:
+            # Reescala para evitar overflow; a ordem relativa se mantém
+            for v in self.atividade:
+                self.atividade[v] *= 1e-100
+            self.incremento_atividade *= 1e-100
+            livres = list(self._no_heap)
+            self._heap, self._no_heap = [], {}
+            for v in livres:
+                self._inserir_heap(v)
+        if var in self._no_heap:
+            self._inserir_heap(var)
+
+    def _retroceder(self, nivel):
+        """Desfaz todas as atribuições acima de 'nivel'."""
+        if len(self.inicio_nivel) <= nivel:
+            return
+        inicio = self.inicio_nivel[nivel]
+        for lit in self.trilha[inicio:]:
+            var = abs(lit)
+            del self.valor[var]
+            del self.nivel[var]
+            del self.razao[var]
+            self._inserir_heap(var)
+        del self.trilha[inicio:]
+        del self.inicio_nivel[nivel:]
+        self.cabeca_propagacao = min(self.cabeca_propagacao, inicio)
+
+    def _vigiar(self, indice):
+        clausula = self.clausulas[indice]
+        self.vigias[clausula[0]].append(indice)
+        self.vigias[clausula[1]].append(indice)
+
+    def adicionar_clausula(self, literais):
+        """
+        TELL: adiciona uma cláusula (disjunção de literais).
+        Literais já falsos no nível 0 são descartados e cláusulas já
+        satisfeitas no nível 0 são ignoradas, então fatos conhecidos não
+        aumentam o trabalho das consultas seguintes.
+        Retorna True se a KB mudou.
+        """
+        self._retroceder(0)
+        if self.inconsistente:
+            return False
+        clausula = []
+        for lit in dict.fromkeys(literais):
+            if -lit in clausula:
+                return False  # Tautologia
+            v = self._valor_literal(lit)
+            if v is True:
+                return False  # Já satisfeita
+            if v is None:
+                clausula.append(lit)
+
+        if not clausula:
+            self.inconsistente = True
+        elif len(clausula) == 1:
+            self._atribuir(clausula[0], None)
+            if self._propagar() is not None:
+                self.inconsistente = True
+        else:
+            self.clausulas.append(clausula)
+            self._vigiar(len(self.clausulas) - 1)
+            for lit in clausula:
+                var = abs(lit)
+                if var not in self.variaveis:
+                    self.variaveis.add(var)
+                    self.atividade[var] = 0.0
+                    self._inserir_heap(var)
+        return True
+
+    def _propagar(self):
+        """Propagação unitária. Retorna o índice da cláusula em conflito ou None."""
+        while self.cabeca_propagacao < len(self.trilha):
+            lit_falso = -self.trilha[self.cabeca_propagacao]
+            self.cabeca_propagacao += 1
+            vigias = self.vigias[lit_falso]
+            self.vigias[lit_falso] = mantidas = []
+            for pos, indice in enumerate(vigias):
+                clausula = self.clausulas[indice]
+                if clausula[0] == lit_falso:
+                    clausula[0], clausula[1] = clausula[1], clausula[0]
+                if self._valor_literal(clausula[0]) is True:
+                    mantidas.append(indice)
+                    continue
+                # Procura outro literal não falso para vigiar
+                for k in range(2, len(clausula)):
+                    if self._valor_literal(clausula[k]) is not False:
+                        clausula[1], clausula[k] = clausula[k], clausula[1]
+                        self.vigias[clausula[1]].append(indice)
+                        break
+                else:
+                    mantidas.append(indice)
+                    if self._valor_literal(clausula[0]) is False:
+                        mantidas.extend(vigias[pos + 1:])
+                        return indice
+                    self._atribuir(clausula[0], indice)
+        return None
+
+    def _analisar(self, conflito):
+        """Deriva a cláusula aprendida (1-UIP) e o nível de retrocesso."""
+        nivel_atual = len(self.inicio_nivel)
+        aprendida = [None]
+        vistos = set()
+        pendentes = 0
+        lit = None
+        idx = len(self.trilha) - 1
+        clausula = self.clausulas[conflito]
+        while True:
+            for q in clausula:
+                var = abs(q)
+                if (lit is not None and var == abs(lit)) or var in vistos or self.nivel[var] == 0:
+                    continue
+                vistos.add(var)
+                self._aumentar_atividade(var)
+                if self.nivel[var] == nivel_atual:
+                    pendentes += 1
+                else:
+                    aprendida.append(q)
+            while abs(self.trilha[idx]) not in vistos:
+                idx -= 1
+            lit = self.trilha[idx]
+            idx -= 1
+            vistos.discard(abs(lit))
+            pendentes -= 1
+            if pendentes == 0:
+                break
+            clausula = self.clausulas[self.razao[abs(lit)]]
+        aprendida[0] = -lit
+        nivel_retorno = max((self.nivel[abs(q)] for q in aprendida[1:]), default=0)
+        return aprendida, nivel_retorno
+
+    def _montar_heap(self, variaveis):
+        """Refaz o heap de decisões com as variáveis livres de 'variaveis'."""
+        self._heap = [(-self.atividade[v], v) for v in variaveis
+                      if v in self.variaveis and v not in self.valor]
+        heapq.heapify(self._heap)
+        self._no_heap = {v: -a for a, v in self._heap}
+
+    def resolver(self, suposicoes=(), variaveis=None):
+        """
+        Retorna True se a KB é satisfatível assumindo os literais de
+        'suposicoes', False caso contrário.
+
+        Com 'variaveis', só elas são decididas e True significa que as
+        cláusulas que as envolvem são satisfatíveis. Isso equivale à KB
+        inteira quando nenhuma cláusula liga essas variáveis a outras
+        variáveis livres e o restante da KB é satisfatível por si só.
+        """
+        self._retroceder(0)
+        if self.inconsistente:
+            return False
+        if self._propagar() is not None:
+            self.inconsistente = True
+            return False
+        if variaveis is not None:
+            self._decidiveis = set(variaveis)
+            self._montar_heap(self._decidiveis)
+        elif self._decidiveis is not None:
+            self._decidiveis = None
+            self._montar_heap(self.variaveis)
+
+        while True:
+            conflito = self._propagar()
+            if conflito is not None:
+                if not self.inicio_nivel:
+                    self.inconsistente = True
+                    return False
+                aprendida, nivel_retorno = self._analisar(conflito)
+                self.incremento_atividade /= 0.95  # Decaimento VSIDS das atividades antigas
+                self._retroceder(nivel_retorno)
+                if len(aprendida) == 1:
+                    self._atribuir(aprendida[0], None)
+                else:
+                    self.clausulas.append(aprendida)
+                    # O segundo vigia deve ser o literal do nível mais alto
+                    k = max(range(1, len(aprendida)), key=lambda i: self.nivel[abs(aprendida[i])])
+                    aprendida[1], aprendida[k] = aprendida[k], aprendida[1]
+                    self._vigiar(len(self.clausulas) - 1)
+                    self._atribuir(aprendida[0], len(self.clausulas) - 1)
+                continue
+
+            nivel = len(self.inicio_nivel)
+            if nivel < len(suposicoes):
+                # As suposições são as primeiras "decisões"
+                lit = suposicoes[nivel]
+                v = self._valor_literal(lit)
+                if v is False:
+                    return False
+                self.inicio_nivel.append(len(self.trilha))
+                if v is None:
+                    self._atribuir(lit, None)
+                continue
+
+            livre = self._proxima_livre()
+            if livre is None:
+                return True
+            self.inicio_nivel.append(len(self.trilha))
+            self._atribuir(-livre, None)  # Fase negativa: "sem perigo" primeiro
+
+class BaseConhecimentoProposicional:
+    """
+    KB proposicional do Mundo de Wumpus em CNF.
+
+    Variáveis: P(casa) = há poço, W(casa) = há Wumpus. As percepções viram
+    cláusulas adicionadas incrementalmente:
+      - casa visitada (e o agente vivo): -P e -W nela;
+      - sem brisa: -P em cada vizinho; com brisa: (P_v1 ou P_v2 ou ...);
+      - idem para fedor e Wumpus;
+      - há um único Wumpus: (-W_a ou -W_b) para cada par de candidatas
+        que já apareceu em alguma cláusula de fedor.
+    Os fatos unitários ficam fixos no nível 0 do resolvedor, então as
+    consultas só envolvem as variáveis da fronteira.
+
+    As variáveis ficam em componentes (union-find) pela relação "aparecem
+    juntas numa cláusula". Um ASK só decide as variáveis livres do
+    componente da variável consultada: as demais cláusulas não as tocam e,
+    vindas das percepções de um mundo real, são satisfatíveis. Assim o custo
+    acompanha a região da fronteira envolvida, não o mundo inteiro.
+
+    Cache do ASK: como a KB só cresce, um literal provado continua provado
+    para sempre. Um "não provado" só pode mudar quando chega uma cláusula
+    ligada ao componente da variável consultada, então só o cache desse
+    componente é descartado. As duas ideias supõem uma KB satisfatível;
+    uma inconsistência detectada no TELL descarta todo o cache.
+    """
+    def __init__(self, tamanho):
+        self.tamanho = tamanho
+        self.sat = ResolvedorSAT()
+        self.candidatas_wumpus = []
+        self._provados = set()
+        self._nao_provados = defaultdict(set)  # raiz do componente -> literais
+        self._pai = {}
+        self._membros = {}  # raiz do componente -> variáveis (as fixadas saem aos poucos)
+        self._alterados = set()  # Raízes que receberam cláusulas (None = todas, KB inconsistente)
+
+    def var_poco(self, pos):
+        return 2 * (pos[0] * self.tamanho + pos[1]) + 1
+
+    def var_wumpus(self, pos):
+        return 2 * (pos[0] * self.tamanho + pos[1]) + 2
+
+    def _raiz(self, var):
+        pai = self._pai
+        while pai.get(var, var) != var:
+            pai[var] = pai.get(pai[var], pai[var])
+            var = pai[var]
+        return var
+
+    def _tell(self, literais):
+        if not self.sat.adicionar_clausula(literais):
+            return
+        if self.sat.inconsistente:
+            self._nao_provados.clear()  # Uma KB inconsistente prova tudo
+            self._alterados = None
+            return
+        raiz = self._raiz(abs(literais[0]))
+        self._nao_provados.pop(raiz, None)
+        for lit in literais[1:]:
+            outra = self._raiz(abs(lit))
+            if outra != raiz:
+                self._nao_provados.pop(outra, None)
+                raiz = self._unir(raiz, outra)
+        if self._alterados is not None:
+            self._alterados.add(raiz)
+
+    def casas_alteradas(self):
+        """
+        Casas com alguma variável em um componente que recebeu cláusulas
+        desde a chamada anterior (None = todas). Nas demais, a resposta do
+        ASK não pode ter mudado. Depois de informadas, as variáveis já
+        fixadas no nível 0 saem do componente.
+        """
+        alterados, self._alterados = self._alterados, set()
+        if alterados is None:
+            return None
+        casas = set()
+        for raiz in {self._raiz(r) for r in alterados}:
+            for v in self._membros.get(raiz, [raiz]):
+                casas.add(divmod((v - 1) // 2, self.tamanho))
+            self._variaveis_livres(raiz)
+        return casas
+
+    def _unir(self, raiz, outra):
+        """Une dois componentes (o menor entra no maior) e retorna a nova raiz."""
+        membros = self._membros.pop(raiz, [raiz])
+        membros_outra = self._membros.pop(outra, [outra])
+        if len(membros) < len(membros_outra):
+            raiz, outra = outra, raiz
+            membros, membros_outra = membros_outra, membros
+        self._pai[outra] = raiz
+        membros.extend(membros_outra)
+        self._membros[raiz] = membros
+        return raiz
+
+    def _variaveis_livres(self, raiz):
+        """Variáveis do componente ainda não fixadas no nível 0 (as fixadas saem da lista de vez)."""
+        nivel = self.sat.nivel
+        membros = [v for v in self._membros.get(raiz, [raiz]) if nivel.get(v) != 0]
+        self._membros[raiz] = membros
+        return membros
+
+    def tell_percepcoes(self, pos, adjacentes, fedor, brisa):
+        """Traduz as percepções em 'pos' para cláusulas."""
+        self._tell([-self.var_poco(pos)])
+        self._tell([-self.var_wumpus(pos)])
+
+        if brisa:
+            self._tell([self.var_poco(a) for a in adjacentes])
+        else:
+            for a in adjacentes:
+                self._tell([-self.var_poco(a)])
+
+        if fedor:
+            for a in adjacentes:
+                if a not in self.candidatas_wumpus:
+                    for outra in self.candidatas_wumpus:
+                        self._tell([-self.var_wumpus(a), -self.var_wumpus(outra)])
+                    self.candidatas_wumpus.append(a)
+            self._tell([self.var_wumpus(a) for a in adjacentes])
+        else:
+            for a in adjacentes:
+                self._tell([-self.var_wumpus(a)])
+
+    def ask(self, literal):
+        """KB |= literal ? (equivale a KB E NÃO literal ser insatisfatível)."""
+        if literal in self._provados:
+            return True
+        raiz = self._raiz(abs(literal))
+        nao_provados = self._nao_provados[raiz]
+        if literal in nao_provados:
+            return False
+        if self.sat.nivel.get(abs(literal)) == 0:
+            # Já é um fato fixo: não precisa de busca
+            resposta = self.sat._valor_literal(literal)
+        else:
+            resposta = not self.sat.resolver([-literal], self._variaveis_livres(raiz))
+        if resposta:
+            self._provados.add(literal)
+        else:
+            nao_provados.add(literal)
+        return resposta
+
+    def eh_segura(self, pos):
+        return self.ask(-self.var_poco(pos)) and self.ask(-self.var_wumpus(pos))
+
+class AgenteLogicoSAT(AgenteLogico):
+    """
+    Agente que decide com consequência lógica completa (via SAT) em vez das
+    quatro regras fixas. Deduz poços e Wumpus a partir de combinações de
+    brisas e fedores e, por isso, encontra casas seguras que o AgenteLogico
+    não vê. A cada passo só são consultadas as casas da fronteira (não
+    visitadas, vizinhas de visitadas) que entraram nela agora ou cujas
+    variáveis ganharam cláusulas novas; a resposta das outras não mudou.
+    """
+    def _iniciar_kb(self):
+        self.kb = BaseConhecimentoProposicional(self.tamanho)
+        self.visitados = set()
+        self.fronteira_desconhecida = set()
+        self._novas_na_fronteira = []
+        self.percepcoes_visitadas = {}  # pos -> (fedor, brisa)
+
+    def _marcar_visitada(self, pos):
+        self.visitados.add(pos)
+        self.fronteira_desconhecida.discard(pos)
+
+    def _eh_segura(self, pos):
+        return pos == (0, 0) or self.kb.eh_segura(pos)
+
+    def _inferir(self, pos, percepcoes):
+        fedor, brisa, brilho = percepcoes
+        adjacentes = self._obter_adjacentes(pos)
+        self.percepcoes_visitadas[pos] = (fedor, brisa)
+        self.kb.tell_percepcoes(pos, adjacentes, fedor, brisa)
+        for a in adjacentes:
+            if a not in self.visitados and a not in self.fronteira_desconhecida:
+                self.fronteira_desconhecida.add(a)
+                self._novas_na_fronteira.append(a)
+
+    def escolher_proxima_acao(self):
+        """Além dos vizinhos da casa atual, promove a seguras as casas da fronteira provadas seguras."""
+        if not self.tem_ouro:
+            alteradas = self.kb.casas_alteradas()
+            if alteradas is None:
+                candidatas = list(self.fronteira_desconhecida)
+            else:
+                candidatas = [pos for pos in alteradas if pos in self.fronteira_desconhecida]
+                candidatas.extend(pos for pos in self._novas_na_fronteira if pos not in alteradas)
+            self._novas_na_fronteira = []
+            for pos in candidatas:
+                if pos in self.fronteira_desconhecida and self._eh_segura(pos):
+                    self.fronteira_desconhecida.discard(pos)
+                    if pos not in self.fronteira_segura:
+                        logger.debug("  [Decisão] Casa %s provada segura pela KB e será explorada.", pos)
+                        self.fronteira_segura.append(pos)
+        return super().escolher_proxima_acao()
+
+class RaciocinioProbabilistico:
+    """
+    Calcula P(poço) e P(Wumpus) para as casas da fronteira (AIMA, cap. 12).
+
+    Poços: cada casa tem um poço independentemente, com probabilidade
+    'prob_poco'. Só as casas da fronteira cujo estado não é conhecido
+    importam; elas são divididas em componentes independentes (casas
+    ligadas por uma mesma brisa) e, em cada componente com k casas, as 2^k
+    configurações são geradas como uma matriz booleana NumPy. As linhas
+    consistentes com todas as brisas são ponderadas pela priori e somadas.
+
+    Wumpus: há exatamente um, uniformemente distribuído entre as casas que
+    ainda podem contê-lo (interseção das vizinhanças com fedor, menos as
+    casas já descartadas). Esses conjuntos são atualizados a cada percepção
+    registrada, sem percorrer a grade.
+    """
+    def __init__(self, tamanho, prob_poco=0.2, limite_componente=20):
+        self.tamanho = tamanho
+        self.prob_poco = prob_poco
+        # Componentes maiores que isso ficam com a priori (2^k linhas seria caro demais)
+        self.limite_componente = limite_componente
+        # Estado incremental do Wumpus (None = ainda não houve fedor)
+        self._registradas = set()
+        self._wumpus_descartadas = set()
+        self._wumpus_candidatas = None
+
+    def _adjacentes(self, pos):
+        r, c = pos
+        candidatos = [(r-1, c), (r+1, c), (r, c-1), (r, c+1)]
+        return [(nr, nc) for nr, nc in candidatos if 0 <= nr < self.tamanho and 0 <= nc < self.tamanho]
+
+    def _probabilidades_poco(self, fronteira, percepcoes):
+        sem_poco = set(percepcoes)
+        for pos, (_, brisa) in percepcoes.items():
+            if not brisa:
+                sem_poco.update(self._adjacentes(pos))
+
+        desconhecidas = [f for f in fronteira if f not in sem_poco]
+        indice = {f: i for i, f in enumerate(desconhecidas)}
+        restricoes = []
+        for pos, (_, brisa) in percepcoes.items():
+            if brisa:
+                casas = [indice[a] for a in self._adjacentes(pos) if a in indice]
+                if casas:
+                    restricoes.append(casas)
+
+        # Componentes independentes (union-find sobre as restrições)
+        pai = list(range(len(desconhecidas)))
+        def raiz(i):
+            while pai[i] != i:
+                pai[i] = pai[pai[i]]
+                i = pai[i]
+            return i
+        for casas in restricoes:
+            for i in casas[1:]:
+                pai[raiz(i)] = raiz(casas[0])
+
+        componentes = defaultdict(list)
+        for i in range(len(desconhecidas)):
+            componentes[raiz(i)].append(i)
+        restricoes_por_componente = defaultdict(list)
+        for casas in restricoes:
+            restricoes_por_componente[raiz(casas[0])].append(casas)
+
+        probs = {f: 0.0 for f in fronteira if f in sem_poco}
+        p = self.prob_poco
+        for r, membros in componentes.items():
+            regras = restricoes_por_componente.get(r, [])
+            k = len(membros)
+            if not regras or k > self.limite_componente:
+                for i in membros:
+                    probs[desconhecidas[i]] = p
+                continue
+            local = {i: j for j, i in enumerate(membros)}
+            # Linha = configuração; coluna = casa do componente
+            configuracoes = ((np.arange(2 ** k)[:, None] >> np.arange(k)) & 1).astype(bool)
+            consistentes = np.ones(2 ** k, dtype=bool)
+            for casas in regras:
+                consistentes &= configuracoes[:, [local[i] for i in casas]].any(axis=1)
+            num_pocos = configuracoes.sum(axis=1)
+            pesos = np.where(consistentes, p ** num_pocos * (1 - p) ** (k - num_pocos), 0.0)
+            marginais = (configuracoes * pesos[:, None]).sum(axis=0) / pesos.sum()
+            for i in membros:
+                probs[desconhecidas[i]] = float(marginais[local[i]])
+        return probs
+
+    def registrar_percepcao(self, pos, fedor):
+        """
+        Atualiza incrementalmente as casas que ainda podem conter o Wumpus.
+        Cada percepção custa O(vizinhos): a casa visitada e, sem fedor, seus
+        vizinhos são descartados; com fedor, as candidatas passam a ser a
+        interseção com a vizinhança (menos as já descartadas).
+        """
+        if pos in self._registradas:
+            return
+        self._registradas.add(pos)
+        adjacentes = self._adjacentes(pos)
+        descartadas = {pos} if fedor else {pos, *adjacentes}
+        self._wumpus_descartadas |= descartadas
+        if fedor:
+            vizinhanca = set(adjacentes) - self._wumpus_descartadas
+            if self._wumpus_candidatas is None:
+                self._wumpus_candidatas = vizinhanca
+            else:
+                self._wumpus_candidatas &= vizinhanca
+        elif self._wumpus_candidatas is not None:
+            self._wumpus_candidatas -= descartadas
+
+    def _probabilidades_wumpus(self, fronteira, percepcoes):
+        for pos, (fedor, _) in percepcoes.items():
+            self.registrar_percepcao(pos, fedor)
+        candidatas = self._wumpus_candidatas
+        if candidatas is None:
+            # Nenhum fedor ainda: qualquer casa não descartada pode ter o Wumpus
+            total = self.tamanho * self.tamanho - len(self._wumpus_descartadas)
+            possivel = lambda f: f not in self._wumpus_descartadas
+        else:
+            total = len(candidatas)
+            possivel = candidatas.__contains__
+        return {f: (1.0 / total if total and possivel(f) else 0.0) for f in fronteira}
+
+    def probabilidades(self, fronteira, percepcoes):
+        """
+        Args:
+            fronteira (iterable): Casas não visitadas vizinhas de visitadas.
+            percepcoes (dict): pos visitada -> (fedor, brisa).
+        Returns:
+            dict: pos -> (P(poço), P(Wumpus)).
+        """
+        fronteira = list(fronteira)
+        p_poco = self._probabilidades_poco(fronteira, percepcoes)
+        p_wumpus = self._probabilidades_wumpus(fronteira, percepcoes)
+        return {f: (p_poco[f], p_wumpus[f]) for f in fronteira}
+
+class AgenteLogicoProbabilistico(AgenteLogicoSAT):
+    """
+    Agente lógico (SAT) com modo probabilístico: quando nenhuma casa é
+    comprovadamente segura, em vez de DESISTIR ele arrisca a casa da
+    fronteira com menor probabilidade de morte, 1 - (1 - P(poço))(1 - P(Wumpus)).
+    """
+    def __init__(self, tamanho, prob_poco=0.2):
+        super().__init__(tamanho)
+        self.raciocinio = RaciocinioProbabilistico(tamanho, prob_poco)
+
+    def _inferir(self, pos, percepcoes):
+        super()._inferir(pos, percepcoes)
+        self.raciocinio.registrar_percepcao(pos, percepcoes[0])
+
+    def escolher_proxima_acao(self):
+        acao = super().escolher_proxima_acao()
+        if acao != "DESISTIR" or not self.fronteira_desconhecida:
+            return acao
+
+        probs = self.raciocinio.probabilidades(self.fronteira_desconhecida, self.percepcoes_visitadas)
+        risco = {pos: 1 - (1 - pp) * (1 - pw) for pos, (pp, pw) in probs.items()}
+        escolhida = min(risco, key=risco.get)
+        logger.debug("  [Decisão] Nenhuma casa segura. Arriscando %s (P(poço)=%.2f, P(Wumpus)=%.2f).",
+                     escolhida, probs[escolhida][0], probs[escolhida][1])
+        self.fronteira_desconhecida.discard(escolhida)
+        return ("MOVER", escolhida)
+
+# --- SIMULAÇÃO EM LOTE ---
+
+AGENTES = {
+    'logico': AgenteLogico,
+    'bits': AgenteLogicoBits,
+    'sat': AgenteLogicoSAT,
+    'probabilistico': AgenteLogicoProbabilistico,
+}
+
+def simular_episodio(semente, agente='logico', tamanho=4, num_pocos=3):
+    """
+    Roda um episódio completo com o mundo gerado a partir de 'semente'.
+    Retorna (resultado, passos, movimentos, tempo_inferencia), onde
+    resultado é "VITORIA", "MORTE" ou "DESISTENCIA".
+    """
+    random.seed(semente)
+    mundo = MundoWumpus(tamanho, num_pocos)
+    agente = AGENTES[agente](tamanho)
+
+    status = "CONTINUAR"
+    passos = 0
+    # Cada passo visita uma casa nova, então o episódio sempre termina;
+    # o limite só protege contra agentes futuros que andem em círculos.
+    while status == "CONTINUAR" and passos <= tamanho * tamanho:
+        status = agente.executar_passo(mundo)
+        passos += 1
+
+    if status == "VITORIA":
+        resultado = "VITORIA"
+    elif mundo.verificar_morte(agente.posicao_atual):
+        resultado = "MORTE"
+    else:
+        resultado = "DESISTENCIA"
+    return resultado, passos, agente.movimentos, agente.tempo_inferencia
+
+def _simular_bloco(args):
+    """Executa um bloco de sementes em um processo trabalhador."""
+    sementes, agente, tamanho, num_pocos = args
+    return [simular_episodio(s, agente, tamanho, num_pocos) for s in sementes]
+
+def simular_lote(num_episodios, agente='logico', tamanho=4, num_pocos=3,
+                 semente_base=0, num_processos=None, tamanho_bloco=1000):
+    """
+    Simula 'num_episodios' episódios (sementes semente_base, semente_base+1, ...)
+    distribuídos em um pool de processos e agrega as métricas.
+    """
+    if num_episodios < 1:
+        raise ValueError(f"num_episodios deve ser >= 1 (recebido {num_episodios})")
+    if num_processos is None:
+        num_processos = os.cpu_count() or 1
+    sementes = range(semente_base, semente_base + num_episodios)
+    blocos = [(sementes[i:i + tamanho_bloco], agente, tamanho, num_pocos)
+              for i in range(0, num_episodios, tamanho_bloco)]
+
+    inicio = time.perf_counter()
+    if num_processos == 1:
+        resultados_blocos = map(_simular_bloco, blocos)
+        episodios = [e for bloco in resultados_blocos for e in bloco]
+    else:
+        with ProcessPoolExecutor(max_workers=num_processos) as executor:
+            episodios = [e for bloco in executor.map(_simular_bloco, blocos) for e in bloco]
+    tempo_total = time.perf_counter() - inicio
+
+    contagem = {"VITORIA": 0, "MORTE": 0, "DESISTENCIA": 0}
+    for resultado, _, _, _ in episodios:
+        contagem[resultado] += 1
+    passos = np.array([e[1] for e in episodios], dtype=float)
+    movimentos = np.array([e[2] for e in episodios], dtype=float)
+    tempos = np.array([e[3] for e in episodios], dtype=float) * 1000
+
+    return {
+        'agente': agente,
+        'tamanho': tamanho,
+        'num_pocos': num_pocos,
+        'episodios': num_episodios,
+        'semente_base': semente_base,
+        'taxa_vitoria': contagem["VITORIA"] / num_episodios,
+        'taxa_morte': contagem["MORTE"] / num_episodios,
+        'taxa_desistencia': contagem["DESISTENCIA"] / num_episodios,
+        'passos_medio': float(passos.mean()),
+        'movimentos_medio': float(movimentos.mean()),
+        'inferencia_ms_medio': float(tempos.mean()),
+        'inferencia_ms_p95': float(np.percentile(tempos, 95)),
+        'tempo_total_s': tempo_total,
+        'episodios_por_segundo': num_episodios / tempo_total if tempo_total > 0 else 0.0,
+    }
+
+def main_lote(argv=None):
+    """CLI do simulador em lote: agrega os episódios e imprime/grava JSON."""
+    parser = argparse.ArgumentParser(description="Simulação em lote de agentes no Mundo de Wumpus.")
+    parser.add_argument('--episodios', type=int, default=100_000)
+    parser.add_argument('--agente', choices=sorted(AGENTES), default='logico')
+    parser.add_argument('--tamanho', type=int, default=4)
+    parser.add_argument('--pocos', type=int, default=3)
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--processos', type=int, default=None)
+    parser.add_argument('--saida', default=None,
+                        help="Arquivo JSON de saída (padrão: imprime na tela).")
+    args = parser.parse_args(argv)
+    if args.episodios < 1:
+        parser.error("--episodios deve ser >= 1")
+
+    relatorio = simular_lote(args.episodios, args.agente, args.tamanho, args.pocos,
+                             args.semente, args.processos)
+    texto = json.dumps(relatorio, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            f.write(texto)
+        print(f"Relatório salvo em '{args.saida}'")
+    else:
+        print(texto)
+
+def main():
+    """Demonstração: um episódio do AgenteLogico com o passo a passo no terminal."""
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s", stream=sys.stdout)
+
     TAMANHO_MUNDO = 4
     mundo = MundoWumpus(TAMANHO_MUNDO)
     agente = AgenteLogico(TAMANHO_MUNDO)
@@ -210,4 +1288,14 @@ if __name__ == "__main__":
     print("      FIM DE JOGO      ")
     print(f"Resultado: {status}")
     print(f"Casas visitadas: {agente.visitados}")
+    print(f"Movimentos realizados: {agente.movimentos}")
     print("="*40)
+
+if __name__ == "__main__":
+    # Sem argumentos: demonstração de um episódio.
+    # Com argumentos: simulação em lote. Ex.:
+    # python3 banco_de_conhecimentos.py --episodios 200000 --agente sat
+    if len(sys.argv) > 1:
+        main_lote()
+    else:
+        main()
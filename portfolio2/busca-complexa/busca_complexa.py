@@ -1,25 +1,43 @@
+import argparse
+import atexit
+import json
 import math
+import os
+import random
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 class JogoDaVelha:
     """
     Classe que gerencia o estado e as regras do Jogo da Velha.
+    Por padrão é o tabuleiro clássico 3x3, mas aceita tabuleiros N x N
+    em que vence quem alinhar 'sequencia' peças (ex.: 15x15 com 5 em linha).
     """
-    def __init__(self):
-        self.tabuleiro = [' ' for _ in range(9)]
+    def __init__(self, tamanho=3, sequencia=None):
+        self.tamanho = tamanho
+        self.sequencia = tamanho if sequencia is None else sequencia
+        self.tabuleiro = [' ' for _ in range(tamanho * tamanho)]
         self.vencedor = None
 
+    def copiar(self):
+        """Retorna uma cópia independente do estado do jogo."""
+        copia = JogoDaVelha(self.tamanho, self.sequencia)
+        copia.tabuleiro = self.tabuleiro[:]
+        copia.vencedor = self.vencedor
+        return copia
+
     def imprimir_tabuleiro(self):
         """Imprime o tabuleiro atual no console."""
+        t = self.tamanho
         print("")
-        for i in range(3):
-            print(" | ".join(self.tabuleiro[i*3:(i+1)*3]))
-            if i < 2:
-                print("---------")
+        for i in range(t):
+            print(" | ".join(self.tabuleiro[i*t:(i+1)*t]))
+            if i < t - 1:
+                print("-" * (4 * t - 3))
         print("")
 
     def obter_acoes_possiveis(self):
-        """Retorna uma lista de posições (0-8) que estão vazias."""
+        """Retorna uma lista das posições vazias (0 a tamanho*tamanho - 1)."""
         return [i for i, spot in enumerate(self.tabuleiro) if spot == ' ']
 
     def fazer_jogada(self, posicao, jogador):
@@ -33,24 +51,21 @@ class JogoDaVelha:
 
     def verificar_vitoria(self, posicao, jogador):
         """Verifica se a jogada na 'posicao' resultou em vitória para o 'jogador'."""
-        linha_idx = posicao // 3
-        linha = self.tabuleiro[linha_idx*3 : (linha_idx+1)*3]
-        if all([spot == jogador for spot in linha]):
-            return True
-        
-        col_idx = posicao % 3
-        coluna = [self.tabuleiro[col_idx + i*3] for i in range(3)]
-        if all([spot == jogador for spot in coluna]):
-            return True
-            
-        if posicao % 2 == 0:
-            diagonal1 = [self.tabuleiro[i] for i in [0, 4, 8]]
-            if all([spot == jogador for spot in diagonal1]):
+        t = self.tamanho
+        linha, col = divmod(posicao, t)
+        # Conta peças consecutivas do jogador nas 4 direções (horizontal,
+        # vertical e as duas diagonais) que passam pela posição jogada.
+        for dl, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            contagem = 1
+            for sentido in (1, -1):
+                l, c = linha + dl * sentido, col + dc * sentido
+                while 0 <= l < t and 0 <= c < t and self.tabuleiro[l * t + c] == jogador:
+                    contagem += 1
+                    l += dl * sentido
+                    c += dc * sentido
+            if contagem >= self.sequencia:
                 return True
-            diagonal2 = [self.tabuleiro[i] for i in [2, 4, 6]]
-            if all([spot == jogador for spot in diagonal2]):
-                return True
-        
+
         return False
 
     def tabuleiro_cheio(self):
@@ -68,10 +83,14 @@ def imprimir_tabuleiro_referencia():
             print("---------")
     print("")
 
-def minimax(estado_jogo, jogador_atual, jogador_ia):
+def minimax(estado_jogo, jogador_atual, jogador_ia, estatisticas=None):
     """
     Algoritmo Minimax para determinar a melhor jogada.
+    Se 'estatisticas' (dict) for informado, acumula em
+    estatisticas['nos_visitados'] o número de nós expandidos.
     """
+    if estatisticas is not None:
+        estatisticas['nos_visitados'] = estatisticas.get('nos_visitados', 0) + 1
     oponente = 'O' if jogador_ia == 'X' else 'X'
     
     if estado_jogo.vencedor == oponente:
@@ -89,7 +108,7 @@ def minimax(estado_jogo, jogador_atual, jogador_ia):
     for jogada_possivel in estado_jogo.obter_acoes_possiveis():
         estado_jogo.fazer_jogada(posicao=jogada_possivel, jogador=jogador_atual)
         proximo_jogador = oponente if jogador_atual == jogador_ia else jogador_ia
-        simulacao = minimax(estado_jogo, proximo_jogador, jogador_ia)
+        simulacao = minimax(estado_jogo, proximo_jogador, jogador_ia, estatisticas)
         
         estado_jogo.tabuleiro[jogada_possivel] = ' '
         estado_jogo.vencedor = None
@@ -105,6 +124,367 @@ def minimax(estado_jogo, jogador_atual, jogador_ia):
                 
     return melhor
 
+class NoMCTS:
+    """
+    Nó da árvore de busca do MCTS.
+    'jogador' é quem fez a jogada que levou a este nó; as vitórias são
+    contadas do ponto de vista dele.
+    """
+    def __init__(self, pai, posicao, jogador, acoes_livres):
+        self.pai = pai
+        self.posicao = posicao
+        self.jogador = jogador
+        self.filhos = []
+        self.acoes_nao_expandidas = acoes_livres
+        self.visitas = 0
+        self.vitorias = 0.0
+
+    def selecionar_filho_uct(self, c):
+        """Escolhe o filho que maximiza a fórmula UCT (UCB1 aplicada a árvores)."""
+        log_visitas = math.log(self.visitas)
+        return max(
+            self.filhos,
+            key=lambda f: f.vitorias / f.visitas + c * math.sqrt(log_visitas / f.visitas)
+        )
+
+def _simulacao_aleatoria(jogo, jogador_da_vez):
+    """
+    Playout: completa a partida com jogadas aleatórias a partir do estado
+    atual e retorna o vencedor ('X', 'O') ou None em caso de empate.
+    """
+    acoes = jogo.obter_acoes_possiveis()
+    random.shuffle(acoes)
+    jogador = jogador_da_vez
+    for posicao in acoes:
+        if jogo.vencedor is not None:
+            break
+        jogo.fazer_jogada(posicao, jogador)
+        jogador = 'O' if jogador == 'X' else 'X'
+    return jogo.vencedor
+
+def _mcts_trabalhador(estado_jogo, jogador_atual, prazo, c, semente):
+    """
+    Executa uma árvore MCTS independente até o instante 'prazo' (em
+    time.time(), comparável entre processos) e retorna as estatísticas dos
+    filhos da raiz: {posicao: (visitas, vitorias)} e o número de playouts
+    realizados.
+    """
+    random.seed(semente)
+    oponente = 'O' if jogador_atual == 'X' else 'X'
+    raiz = NoMCTS(None, None, oponente, estado_jogo.obter_acoes_possiveis())
+    playouts = 0
+
+    while True:
+        # O relógio é consultado a cada 16 playouts para reduzir overhead.
+        if playouts % 16 == 0 and time.time() >= prazo and playouts > 0:
+            break
+
+        no = raiz
+        jogo = estado_jogo.copiar()
+
+        # 1. Seleção
+        while not no.acoes_nao_expandidas and no.filhos:
+            no = no.selecionar_filho_uct(c)
+            jogo.fazer_jogada(no.posicao, no.jogador)
+
+        # 2. Expansão
+        if no.acoes_nao_expandidas and jogo.vencedor is None:
+            idx = random.randrange(len(no.acoes_nao_expandidas))
+            acoes = no.acoes_nao_expandidas
+            acoes[idx], acoes[-1] = acoes[-1], acoes[idx]
+            posicao = acoes.pop()
+            jogador = 'O' if no.jogador == 'X' else 'X'
+            jogo.fazer_jogada(posicao, jogador)
+            filho = NoMCTS(no, posicao, jogador,
+                           [] if jogo.vencedor else jogo.obter_acoes_possiveis())
+            no.filhos.append(filho)
+            no = filho
+
+        # 3. Simulação
+        proximo = 'O' if no.jogador == 'X' else 'X'
+        vencedor = _simulacao_aleatoria(jogo, proximo)
+        playouts += 1
+
+        # 4. Retropropagação
+        while no is not None:
+            no.visitas += 1
+            if vencedor == no.jogador:
+                no.vitorias += 1
+            elif vencedor is None:
+                no.vitorias += 0.5
+            no = no.pai
+
+    estatisticas = {f.posicao: (f.visitas, f.vitorias) for f in raiz.filhos}
+    return estatisticas, playouts
+
+_POOLS = {}
+
+def _obter_pool(num_processos):
+    """
+    Pool de processos persistente, criado na primeira chamada e reaproveitado
+    pelas seguintes (iniciar processos custa mais que uma jogada rápida).
+    """
+    pool = _POOLS.get(num_processos)
+    if pool is None:
+        pool = _POOLS[num_processos] = ProcessPoolExecutor(max_workers=num_processos)
+    return pool
+
+@atexit.register
+def _encerrar_pools():
+    for pool in _POOLS.values():
+        pool.shutdown()
+    _POOLS.clear()
+
+def mcts(estado_jogo, jogador_atual, tempo_limite=1.0, num_processos=None,
+         c=math.sqrt(2), semente=None, executor=None):
+    """
+    Monte Carlo Tree Search (UCT) com paralelização na raiz.
+
+    Cada processo constrói sua própria árvore a partir do estado atual
+    durante 'tempo_limite' segundos; ao final, as visitas e vitórias dos
+    filhos da raiz são somadas e a jogada mais visitada é escolhida.
+    Indicado para tabuleiros grandes, onde o minimax exato é inviável.
+
+    Retorna um dicionário com 'posicao' (como no minimax), 'taxa_vitoria'
+    da jogada escolhida para 'jogador_atual' (em [0, 1], empates valem 0.5;
+    não é a escala de 'pontuacao' do minimax) e as métricas 'playouts' e
+    'playouts_por_segundo'. Como cada playout expande um nó, 'nos_visitados'
+    é igual ao número de playouts. Em um estado terminal (sem jogadas
+    possíveis), 'posicao' e 'taxa_vitoria' são None.
+
+    Sem 'executor', os processos vêm de um pool persistente do módulo. O
+    prazo é contado a partir da chamada, então o tempo de criação do pool
+    e de envio das tarefas entra em 'tempo_limite'.
+    """
+    inicio = time.perf_counter()
+    prazo = time.time() + tempo_limite
+    if estado_jogo.vencedor is not None or not estado_jogo.obter_acoes_possiveis():
+        return {'posicao': None, 'taxa_vitoria': None, 'playouts': 0,
+                'nos_visitados': 0, 'playouts_por_segundo': 0.0}
+    if num_processos is None:
+        num_processos = os.cpu_count() or 1
+    if semente is None:
+        semente = random.randrange(2**32)
+    sementes = [semente + i for i in range(num_processos)]
+
+    if num_processos == 1 and executor is None:
+        resultados = [_mcts_trabalhador(estado_jogo, jogador_atual, prazo, c, sementes[0])]
+    else:
+        pool = executor or _obter_pool(num_processos)
+        futuros = [
+            pool.submit(_mcts_trabalhador, estado_jogo, jogador_atual, prazo, c, s)
+            for s in sementes
+        ]
+        resultados = [f.result() for f in futuros]
+    tempo = time.perf_counter() - inicio
+
+    # Junta as estatísticas de todas as árvores
+    visitas = {}
+    vitorias = {}
+    total_playouts = 0
+    for estatisticas, playouts in resultados:
+        total_playouts += playouts
+        for posicao, (v, w) in estatisticas.items():
+            visitas[posicao] = visitas.get(posicao, 0) + v
+            vitorias[posicao] = vitorias.get(posicao, 0.0) + w
+
+    melhor_posicao = max(visitas, key=visitas.get)
+    return {
+        'posicao': melhor_posicao,
+        'taxa_vitoria': vitorias[melhor_posicao] / visitas[melhor_posicao],
+        'playouts': total_playouts,
+        'nos_visitados': total_playouts,
+        'playouts_por_segundo': total_playouts / tempo if tempo > 0 else 0.0,
+    }
+
+# --- ARENA HEADLESS (IA vs IA) ---
+
+class MotorMinimax:
+    """Motor de jogo baseado no minimax exato."""
+    def __init__(self):
+        self.nome = "minimax"
+
+    def escolher(self, jogo, jogador, rng):
+        estatisticas = {'nos_visitados': 0}
+        resultado = minimax(jogo, jogador, jogador, estatisticas)
+        return resultado['posicao'], estatisticas['nos_visitados']
+
+class MotorMCTS:
+    """
+    Motor de jogo baseado no MCTS com orçamento de tempo por jogada.
+    Com num_processos > 1, o motor cria um único pool na primeira jogada e
+    o reaproveita em todas as seguintes; chame fechar() ao terminar.
+    """
+    def __init__(self, tempo_limite=0.05, num_processos=1):
+        self.nome = "mcts"
+        self.tempo_limite = tempo_limite
+        self.num_processos = num_processos
+        self._pool = None
+
+    def escolher(self, jogo, jogador, rng):
+        if self.num_processos > 1 and self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.num_processos)
+        resultado = mcts(jogo, jogador, tempo_limite=self.tempo_limite,
+                         num_processos=self.num_processos,
+                         semente=rng.randrange(2**32), executor=self._pool)
+        return resultado['posicao'], resultado['nos_visitados']
+
+    def fechar(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+class MotorAleatorio:
+    """Motor de referência que joga em uma casa livre qualquer."""
+    def __init__(self):
+        self.nome = "aleatorio"
+
+    def escolher(self, jogo, jogador, rng):
+        return rng.choice(jogo.obter_acoes_possiveis()), 1
+
+MOTORES = {
+    'minimax': MotorMinimax,
+    'mcts': MotorMCTS,
+    'aleatorio': MotorAleatorio,
+}
+
+def _percentil(valores_ordenados, p):
+    """Percentil pelo método do posto mais próximo (lista já ordenada)."""
+    if not valores_ordenados:
+        return 0.0
+    idx = max(0, math.ceil(p / 100 * len(valores_ordenados)) - 1)
+    return valores_ordenados[idx]
+
+def jogar_partida(motor_x, motor_o, rng, tamanho=3, sequencia=None, jogadas_abertura=0):
+    """
+    Joga uma partida completa sem interação entre 'motor_x' e 'motor_o'.
+    As 'jogadas_abertura' primeiras jogadas são sorteadas com 'rng' para
+    diversificar as partidas de forma reprodutível.
+
+    Retorna o vencedor ('X', 'O' ou None) e a lista de jogadas dos motores
+    no formato (jogador, nos_visitados, latencia_em_segundos).
+    """
+    jogo = JogoDaVelha(tamanho, sequencia)
+    motores = {'X': motor_x, 'O': motor_o}
+    jogador = 'X'
+    jogadas = []
+
+    while jogo.vencedor is None and not jogo.tabuleiro_cheio():
+        if jogadas_abertura > 0:
+            posicao = rng.choice(jogo.obter_acoes_possiveis())
+            jogadas_abertura -= 1
+        else:
+            inicio = time.perf_counter()
+            posicao, nos = motores[jogador].escolher(jogo, jogador, rng)
+            jogadas.append((jogador, nos, time.perf_counter() - inicio))
+        jogo.fazer_jogada(posicao, jogador)
+        jogador = 'O' if jogador == 'X' else 'X'
+
+    return jogo.vencedor, jogadas
+
+def arena(motor_a, motor_b, num_partidas, tamanho=3, sequencia=None,
+          jogadas_abertura=2, semente=0):
+    """
+    Disputa 'num_partidas' entre dois motores, alternando quem joga com 'X'.
+    A partida i usa um gerador próprio, semeado com (semente, i): a abertura
+    não depende de quantos números os motores consumiram nas partidas
+    anteriores, então os mesmos parâmetros geram as mesmas aberturas para
+    qualquer par de motores.
+
+    Retorna um dicionário serializável em JSON com os resultados e, para
+    cada motor, nós visitados, nós por segundo e percentis de latência.
+    """
+    resultados = {'a': 0, 'b': 0, 'empates': 0}
+    nos = {'a': 0, 'b': 0}
+    latencias = {'a': [], 'b': []}
+
+    inicio = time.perf_counter()
+    for i in range(num_partidas):
+        # Alterna as cores para não favorecer quem começa
+        cores = {'X': 'a', 'O': 'b'} if i % 2 == 0 else {'X': 'b', 'O': 'a'}
+        motor_x = motor_a if cores['X'] == 'a' else motor_b
+        motor_o = motor_b if cores['O'] == 'b' else motor_a
+        rng = random.Random(f"{semente}:{i}")
+        vencedor, jogadas = jogar_partida(motor_x, motor_o, rng, tamanho,
+                                          sequencia, jogadas_abertura)
+
+        if vencedor is None:
+            resultados['empates'] += 1
+        else:
+            resultados[cores[vencedor]] += 1
+        for jogador, n, latencia in jogadas:
+            nos[cores[jogador]] += n
+            latencias[cores[jogador]].append(latencia)
+    tempo_total = time.perf_counter() - inicio
+
+    relatorio = {
+        'partidas': num_partidas,
+        'tamanho': tamanho,
+        'sequencia': tamanho if sequencia is None else sequencia,
+        'jogadas_abertura': jogadas_abertura,
+        'semente': semente,
+        'tempo_total_s': tempo_total,
+        'empates': resultados['empates'],
+        'motores': {},
+    }
+    for chave, motor in (('a', motor_a), ('b', motor_b)):
+        lat = sorted(latencias[chave])
+        tempo_busca = sum(lat)
+        relatorio['motores'][chave] = {
+            'nome': motor.nome,
+            'vitorias': resultados[chave],
+            'jogadas': len(lat),
+            'nos_visitados': nos[chave],
+            'nos_por_segundo': nos[chave] / tempo_busca if tempo_busca > 0 else 0.0,
+            'latencia_ms': {
+                'p50': _percentil(lat, 50) * 1000,
+                'p90': _percentil(lat, 90) * 1000,
+                'p99': _percentil(lat, 99) * 1000,
+                'max': (lat[-1] if lat else 0.0) * 1000,
+            },
+        }
+    return relatorio
+
+def _criar_motor(nome, args):
+    """Instancia um motor a partir do nome e dos argumentos da linha de comando."""
+    if nome == 'mcts':
+        return MotorMCTS(tempo_limite=args.tempo_mcts, num_processos=args.processos_mcts)
+    return MOTORES[nome]()
+
+def main_arena(argv=None):
+    """CLI da arena: joga as partidas e grava o relatório em JSON."""
+    parser = argparse.ArgumentParser(description="Arena headless de IA vs IA para o Jogo da Velha.")
+    parser.add_argument('--motor-a', choices=sorted(MOTORES), default='minimax')
+    parser.add_argument('--motor-b', choices=sorted(MOTORES), default='aleatorio')
+    parser.add_argument('--partidas', type=int, default=1000)
+    parser.add_argument('--tamanho', type=int, default=3)
+    parser.add_argument('--sequencia', type=int, default=None)
+    parser.add_argument('--abertura', type=int, default=2,
+                        help="Número de jogadas iniciais sorteadas em cada partida.")
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--tempo-mcts', type=float, default=0.05,
+                        help="Orçamento de tempo por jogada do MCTS (s).")
+    parser.add_argument('--processos-mcts', type=int, default=1)
+    parser.add_argument('--saida', default=None,
+                        help="Arquivo JSON de saída (padrão: imprime na tela).")
+    args = parser.parse_args(argv)
+
+    motores = (_criar_motor(args.motor_a, args), _criar_motor(args.motor_b, args))
+    try:
+        relatorio = arena(*motores, args.partidas, args.tamanho, args.sequencia,
+                          args.abertura, args.semente)
+    finally:
+        for motor in motores:
+            if isinstance(motor, MotorMCTS):
+                motor.fechar()
+    texto = json.dumps(relatorio, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            f.write(texto)
+        print(f"Relatório salvo em '{args.saida}'")
+    else:
+        print(texto)
+
 def jogar():
     """Função principal que gerencia o fluxo do jogo."""
     jogo = JogoDaVelha()
@@ -166,4 +546,10 @@ def jogar():
         print("Deu empate!")
 
 if __name__ == "__main__":
-    jogar()
+    import sys
+    # Sem argumentos: jogo interativo. Com argumentos: arena headless.
+    # Ex.: python3 busca_complexa.py --motor-a minimax --motor-b mcts --partidas 2000
+    if len(sys.argv) > 1:
+        main_arena()
+    else:
+        jogar()
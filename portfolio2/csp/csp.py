@@ -1,4 +1,52 @@
+import json
+import os
 import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Acima deste tamanho o tabuleiro não é desenhado por completo.
+LIMITE_IMPRESSAO_TABULEIRO = 40
+
+def _contar_subarvore(n, col, linhas, diag_desc, diag_asc):
+    """
+    Conta todas as soluções da subárvore que começa na coluna 'col' com as
+    máscaras de bits informadas (mesma convenção de ResolvedorNRainhasBitmask).
+    Usa uma pilha explícita para evitar o custo de chamadas recursivas.
+    Retorna (numero_de_solucoes, nos_visitados).
+    """
+    mascara_cheia = (1 << n) - 1
+    if col == n:
+        return 1, 1
+
+    solucoes = 0
+    nos = 1
+    pilha = [(linhas, diag_desc, diag_asc, ~(linhas | diag_desc | diag_asc) & mascara_cheia)]
+    while pilha:
+        linhas, diag_desc, diag_asc, livres = pilha[-1]
+        if not livres:
+            pilha.pop()
+            continue
+        bit = livres & -livres
+        pilha[-1] = (linhas, diag_desc, diag_asc, livres ^ bit)
+        nos += 1
+
+        novas_linhas = linhas | bit
+        if novas_linhas == mascara_cheia:
+            solucoes += 1
+            continue
+        novo_desc = ((diag_desc | bit) << 1) & mascara_cheia
+        novo_asc = (diag_asc | bit) >> 1
+        pilha.append((novas_linhas, novo_desc, novo_asc,
+                      ~(novas_linhas | novo_desc | novo_asc) & mascara_cheia))
+
+    return solucoes, nos
+
+def _contar_tarefa(tarefa):
+    """Executa uma tarefa de contagem no processo trabalhador e aplica seu peso."""
+    peso, n, col, linhas, diag_desc, diag_asc = tarefa
+    solucoes, nos = _contar_subarvore(n, col, linhas, diag_desc, diag_asc)
+    return peso * solucoes, nos
 
 class ResolvedorNRainhas:
     """
@@ -88,19 +136,794 @@ class ResolvedorNRainhas:
         else:
             return None # Nenhuma solução encontrada
 
+    def _colunas_em_conflito(self, posicoes, diag_desc, diag_asc):
+        """Retorna (vetorizado) as colunas cujas rainhas ainda estão sob ataque."""
+        n = self.n
+        colunas = np.arange(n)
+        em_conflito = (diag_desc[posicoes - colunas + n - 1] > 1) | (diag_asc[posicoes + colunas] > 1)
+        return np.flatnonzero(em_conflito)
+
+    def resolver_min_conflitos(self, max_passos=None, tentativas_por_rainha=100, semente=None):
+        """
+        Busca local por conflitos mínimos (min-conflicts), para N muito grande.
+
+        A atribuição é mantida como uma permutação (uma rainha por linha e por
+        coluna), então a restrição de linha vale sempre e só as diagonais
+        podem conflitar. Os contadores de rainhas por diagonal ficam em
+        vetores NumPy, o que torna a avaliação de qualquer movimento O(1).
+
+        1. Posicionamento guloso, em rodadas vetorizadas: cada coluna ainda
+           vazia recebe uma linha livre sorteada, e são aceitas só as
+           propostas sem nenhum conflito (nem com as rainhas já fixadas nem
+           entre si). Quando as rodadas param de render, o resto das colunas
+           recebe as linhas que sobraram.
+        2. Reparo: para cada rainha em conflito, sorteia até
+           'tentativas_por_rainha' outras colunas e troca as linhas das duas
+           assim que a troca reduzir o número de pares em ataque. Se uma
+           passada inteira não melhorar nada (mínimo local, comum para N
+           pequeno), faz uma troca aleatória para escapar.
+
+        Retorna a solução como vetor NumPy (índice = coluna, valor = linha)
+        ou None se 'max_passos' se esgotar. Cada troca avaliada conta como um
+        nó visitado.
+        """
+        n = self.n
+        rng = np.random.default_rng(semente)
+        if max_passos is None:
+            max_passos = 100 * n + 100_000
+
+        posicoes = np.full(n, -1, dtype=np.int64)
+        diag_desc = np.zeros(2 * n - 1, dtype=np.int32)  # índice: linha - coluna + n - 1
+        diag_asc = np.zeros(2 * n - 1, dtype=np.int32)   # índice: linha + coluna
+        self.nos_visitados = 0
+
+        # --- 1. Posicionamento guloso em rodadas ---
+        colunas_livres = np.arange(n)
+        linhas_livres = np.arange(n)
+        rodadas_sem_progresso = 0
+        while len(colunas_livres) > 0 and rodadas_sem_progresso < 3:
+            linhas_sorteadas = rng.permutation(linhas_livres)
+            desc = linhas_sorteadas - colunas_livres + n - 1
+            asc = linhas_sorteadas + colunas_livres
+            self.nos_visitados += len(colunas_livres)
+
+            # Sem conflito com as rainhas já fixadas...
+            aceitas = (diag_desc[desc] == 0) & (diag_asc[asc] == 0)
+            # ...nem com outra proposta desta rodada (fica a primeira de cada diagonal)
+            for diag in (desc, asc):
+                primeira = np.zeros(len(diag), dtype=bool)
+                primeira[np.unique(diag, return_index=True)[1]] = True
+                aceitas &= primeira
+
+            if aceitas.sum() < max(1, len(colunas_livres) // 100):
+                rodadas_sem_progresso += 1
+            else:
+                rodadas_sem_progresso = 0
+            if not aceitas.any():
+                continue
+
+            posicoes[colunas_livres[aceitas]] = linhas_sorteadas[aceitas]
+            diag_desc[desc[aceitas]] += 1
+            diag_asc[asc[aceitas]] += 1
+            colunas_livres = colunas_livres[~aceitas]
+            linhas_livres = linhas_sorteadas[~aceitas]
+
+        # As colunas restantes ficam com as linhas que sobraram (com conflitos)
+        if len(colunas_livres) > 0:
+            posicoes[colunas_livres] = linhas_livres
+            np.add.at(diag_desc, linhas_livres - colunas_livres + n - 1, 1)
+            np.add.at(diag_asc, linhas_livres + colunas_livres, 1)
+
+        # --- 2. Reparo por trocas ---
+        passos = 0
+        candidatas = self._colunas_em_conflito(posicoes, diag_desc, diag_asc)
+        while len(candidatas) > 0:
+            houve_melhora = False
+            rng.shuffle(candidatas)
+            parceiras = iter(rng.integers(n, size=len(candidatas) * tentativas_por_rainha).tolist())
+            for i in candidatas.tolist():
+                linha_i = int(posicoes[i])
+                if diag_desc[linha_i - i + n - 1] + diag_asc[linha_i + i] <= 2:
+                    continue  # Já deixou de estar em conflito
+                for _ in range(tentativas_por_rainha):
+                    j = next(parceiras)
+                    if j == i:
+                        continue
+                    passos += 1
+                    if passos > max_passos:
+                        self.nos_visitados += passos
+                        return None
+                    linha_j = int(posicoes[j])
+
+                    # Variação exata do número de pares em ataque, em O(1):
+                    # remove as duas rainhas e as recoloca com as linhas trocadas.
+                    d_i, a_i = linha_i - i + n - 1, linha_i + i
+                    d_j, a_j = linha_j - j + n - 1, linha_j + j
+                    diag_desc[d_i] -= 1; diag_asc[a_i] -= 1
+                    delta = -(diag_desc[d_i] + diag_asc[a_i])
+                    diag_desc[d_j] -= 1; diag_asc[a_j] -= 1
+                    delta -= diag_desc[d_j] + diag_asc[a_j]
+
+                    nd_i, na_i = linha_j - i + n - 1, linha_j + i
+                    nd_j, na_j = linha_i - j + n - 1, linha_i + j
+                    delta += diag_desc[nd_i] + diag_asc[na_i]
+                    diag_desc[nd_i] += 1; diag_asc[na_i] += 1
+                    delta += diag_desc[nd_j] + diag_asc[na_j]
+                    diag_desc[nd_j] += 1; diag_asc[na_j] += 1
+
+                    if delta < 0:
+                        posicoes[i], posicoes[j] = linha_j, linha_i
+                        houve_melhora = True
+                        break
+
+                    # Desfaz a troca
+                    diag_desc[nd_i] -= 1; diag_asc[na_i] -= 1
+                    diag_desc[nd_j] -= 1; diag_asc[na_j] -= 1
+                    diag_desc[d_i] += 1; diag_asc[a_i] += 1
+                    diag_desc[d_j] += 1; diag_asc[a_j] += 1
+
+            if not houve_melhora:
+                # Mínimo local: troca uma rainha em conflito com outra qualquer
+                i, j = int(candidatas[0]), int(rng.integers(n))
+                linha_i, linha_j = int(posicoes[i]), int(posicoes[j])
+                diag_desc[linha_i - i + n - 1] -= 1; diag_asc[linha_i + i] -= 1
+                diag_desc[linha_j - j + n - 1] -= 1; diag_asc[linha_j + j] -= 1
+                diag_desc[linha_j - i + n - 1] += 1; diag_asc[linha_j + i] += 1
+                diag_desc[linha_i - j + n - 1] += 1; diag_asc[linha_i + j] += 1
+                posicoes[i], posicoes[j] = linha_j, linha_i
+            candidatas = self._colunas_em_conflito(posicoes, diag_desc, diag_asc)
+
+        self.nos_visitados += passos
+        self.posicoes = posicoes
+        return posicoes
+
+    def _dividir_tarefas(self):
+        """
+        Divide a árvore de busca pelas duas primeiras colunas.
+
+        Pela simetria de espelhamento horizontal, toda solução com a rainha
+        da coluna 0 na linha r tem uma gêmea com a rainha na linha N-1-r.
+        Basta explorar a metade superior da coluna 0 e contar em dobro; se N
+        for ímpar, a linha do meio é sua própria imagem e tem peso 1.
+        """
+        n = self.n
+        mascara_cheia = (1 << n) - 1
+        tarefas = []
+        for linha0 in range((n + 1) // 2):
+            peso = 1 if (n % 2 == 1 and linha0 == n // 2) else 2
+            bit0 = 1 << linha0
+            desc = (bit0 << 1) & mascara_cheia
+            asc = bit0 >> 1
+            if n == 1:
+                tarefas.append((peso, n, 1, bit0, desc, asc))
+                continue
+            livres = ~(bit0 | desc | asc) & mascara_cheia
+            while livres:
+                bit1 = livres & -livres
+                livres ^= bit1
+                tarefas.append((
+                    peso, n, 2, bit0 | bit1,
+                    ((desc | bit1) << 1) & mascara_cheia,
+                    (asc | bit1) >> 1,
+                ))
+        return tarefas
+
+    def contar_solucoes(self, num_processos=None):
+        """
+        Conta todas as soluções do problema (não para na primeira).
+
+        As subárvores definidas pelas duas primeiras rainhas são distribuídas
+        entre processos com um ProcessPoolExecutor e as contagens são somadas.
+        O total de nós explorados fica em self.nos_visitados.
+        """
+        if num_processos is None:
+            num_processos = os.cpu_count() or 1
+        tarefas = self._dividir_tarefas()
+
+        if num_processos == 1:
+            resultados = map(_contar_tarefa, tarefas)
+            total, self.nos_visitados = self._somar_resultados(resultados)
+        else:
+            with ProcessPoolExecutor(max_workers=num_processos) as executor:
+                # As subárvores têm tamanhos bem diferentes; chunksize=1
+                # mantém o balanceamento de carga entre os processos.
+                resultados = executor.map(_contar_tarefa, tarefas, chunksize=1)
+                total, self.nos_visitados = self._somar_resultados(resultados)
+        return total
+
+    def _somar_resultados(self, resultados):
+        """Soma (solucoes, nos) de todas as tarefas."""
+        total = 0
+        nos = 0
+        for solucoes, nos_tarefa in resultados:
+            total += solucoes
+            nos += nos_tarefa
+        return total, nos
+
     def imprimir_solucao(self, solucao):
-        """Imprime o tabuleiro de forma visual."""
+        """
+        Imprime o tabuleiro de forma visual.
+        Para N grande, desenhar N x N casas é inviável; nesse caso imprime
+        apenas as primeiras e últimas atribuições (coluna: linha).
+        """
         print(f"\n--- Solução para N = {self.n} ---")
+        if self.n > LIMITE_IMPRESSAO_TABULEIRO:
+            amostra = 10
+            inicio = ", ".join(f"{col}: {solucao[col]}" for col in range(amostra))
+            fim = ", ".join(f"{col}: {solucao[col]}" for col in range(self.n - amostra, self.n))
+            print(f"Tabuleiro grande demais para desenhar (N > {LIMITE_IMPRESSAO_TABULEIRO}).")
+            print(f"(coluna: linha) {inicio}, ..., {fim}")
+            return
         for linha in range(self.n):
-            linha_str = ""
-            for col in range(self.n):
-                if solucao[col] == linha:
-                    linha_str += " Q "
-                else:
-                    linha_str += " . "
-            print(linha_str)
+            print("".join(" Q " if solucao[col] == linha else " . " for col in range(self.n)))
         print("-" * (self.n * 3))
 
+class ResolvedorNRainhasBitmask(ResolvedorNRainhas):
+    """
+    Variante do resolvedor que representa as restrições como máscaras de bits.
+
+    Em vez de percorrer as colunas anteriores (O(N) por verificação), mantém
+    três inteiros com as linhas ocupadas e as duas famílias de diagonais
+    atacadas na coluna atual. As linhas livres são obtidas com uma única
+    operação, e a próxima candidata é o bit menos significativo
+    (mascara & -mascara), ambos em O(1).
+    A ordem de exploração (linha 0 primeiro) é a mesma do resolvedor original,
+    então a solução e os nós visitados coincidem.
+    """
+    def __init__(self, n):
+        super().__init__(n)
+        self.mascara_cheia = (1 << n) - 1
+
+    def _resolver_bitmask_util(self, col, linhas, diag_desc, diag_asc):
+        """
+        Backtracking com máscaras.
+        'diag_desc' e 'diag_asc' já estão deslocadas para a coluna 'col':
+        o bit i indica que a linha i está atacada por alguma diagonal.
+        """
+        self.nos_visitados += 1
+
+        if col == self.n:
+            return True
+
+        # Linhas que não são atacadas por nenhuma rainha já posicionada
+        livres = ~(linhas | diag_desc | diag_asc) & self.mascara_cheia
+        while livres:
+            bit = livres & -livres  # Menor linha livre
+            livres ^= bit
+            self.posicoes[col] = bit.bit_length() - 1
+
+            if self._resolver_bitmask_util(
+                col + 1,
+                linhas | bit,
+                ((diag_desc | bit) << 1) & self.mascara_cheia,
+                (diag_asc | bit) >> 1,
+            ):
+                return True
+
+            self.posicoes[col] = -1
+
+        return False
+
+    def resolver(self):
+        """Inicia a busca com todas as máscaras vazias."""
+        if self._resolver_bitmask_util(0, 0, 0, 0):
+            return self.posicoes
+        else:
+            return None
+
+# --- MOTOR GENÉRICO DE CSP ---
+
+class ProblemaCSP:
+    """
+    Descrição de um CSP: variáveis, domínios, restrições binárias e
+    restrições AllDifferent n-árias.
+
+    Os domínios são guardados como bitsets (inteiros): o bit k do domínio
+    da variável i indica que o valor self.valores[i][k] ainda é possível.
+    Cada arco (i, j) guarda uma função 'suporte(k)' que devolve a máscara
+    dos valores de j compatíveis com o valor k de i; com ela, a checagem
+    e a poda de domínios viram operações de bits. Cada AllDifferent é
+    guardado como a lista dos índices das suas variáveis, e 'grupos_de[i]'
+    diz em quais deles a variável i aparece.
+    """
+    def __init__(self, variaveis, dominios):
+        """
+        Args:
+            variaveis (list): Nomes das variáveis.
+            dominios (dict): Lista de valores possíveis para cada variável.
+        """
+        self.variaveis = list(variaveis)
+        self.indice = {v: i for i, v in enumerate(self.variaveis)}
+        self.valores = [list(dominios[v]) for v in self.variaveis]
+        self.vizinhos = [set() for _ in self.variaveis]
+        self.suportes = {}
+        self.todos_diferentes = []
+        self.grupos_de = [[] for _ in self.variaveis]
+
+    def dominios_iniciais(self):
+        """Retorna a lista de bitsets com todos os valores permitidos."""
+        return [(1 << len(vals)) - 1 for vals in self.valores]
+
+    def _adicionar_arco(self, i, j, suporte):
+        """Registra o arco (i, j); restrições repetidas no mesmo par são combinadas (E lógico)."""
+        anterior = self.suportes.get((i, j))
+        if anterior is None:
+            self.suportes[(i, j)] = suporte
+        else:
+            self.suportes[(i, j)] = lambda k: anterior(k) & suporte(k)
+        self.vizinhos[i].add(j)
+
+    def adicionar_restricao(self, x, y, predicado):
+        """
+        Adiciona uma restrição binária genérica entre 'x' e 'y'.
+        'predicado(valor_x, valor_y)' deve retornar True se o par é permitido.
+        As máscaras de suporte são pré-calculadas nos dois sentidos.
+        """
+        i, j = self.indice[x], self.indice[y]
+        vals_i, vals_j = self.valores[i], self.valores[j]
+        suporte_ij = [0] * len(vals_i)
+        suporte_ji = [0] * len(vals_j)
+        for a, va in enumerate(vals_i):
+            for b, vb in enumerate(vals_j):
+                if predicado(va, vb):
+                    suporte_ij[a] |= 1 << b
+                    suporte_ji[b] |= 1 << a
+        self._adicionar_arco(i, j, suporte_ij.__getitem__)
+        self._adicionar_arco(j, i, suporte_ji.__getitem__)
+
+    def adicionar_restricao_suporte(self, x, y, suporte_xy, suporte_yx):
+        """
+        Adiciona uma restrição binária já descrita por funções de suporte
+        (índice do valor -> máscara de valores compatíveis do outro lado).
+        Útil quando a máscara tem fórmula fechada e pré-calcular a tabela
+        inteira seria caro.
+        """
+        i, j = self.indice[x], self.indice[y]
+        self._adicionar_arco(i, j, suporte_xy)
+        self._adicionar_arco(j, i, suporte_yx)
+
+    def adicionar_todos_diferentes(self, variaveis):
+        """
+        Restrição global AllDifferent, propagada como um todo pelo resolvedor
+        (ver ResolvedorCSP._propagar_todos_diferentes), o que poda mais que
+        as desigualdades par a par: p.ex. 3 variáveis com domínio {1, 2}
+        são inconsistentes, mas cada par isolado é arco-consistente.
+
+        O propagador compara bits, então exige que as variáveis tenham a
+        mesma lista de valores; caso contrário, a restrição é decomposta em
+        desigualdades binárias.
+        """
+        indices = [self.indice[v] for v in variaveis]
+        if any(self.valores[i] != self.valores[indices[0]] for i in indices):
+            for a in range(len(indices)):
+                for b in range(a + 1, len(indices)):
+                    self.adicionar_restricao(self.variaveis[indices[a]], self.variaveis[indices[b]],
+                                             lambda va, vb: va != vb)
+            return
+        grupo = len(self.todos_diferentes)
+        self.todos_diferentes.append(indices)
+        for i in indices:
+            self.grupos_de[i].append(grupo)
+
+class ResolvedorCSP:
+    """
+    Backtracking para qualquer ProblemaCSP, com heurísticas e propagação:
+
+    - MRV (menor domínio restante), desempatando pelo grau (mais restrições
+      com variáveis ainda não atribuídas);
+    - LCV (valor menos restritivo primeiro);
+    - Forward checking após cada atribuição;
+    - AC-3 após cada atribuição (MAC), que já inclui a poda do forward
+      checking e funciona com ou sem ele;
+    - Propagador próprio para AllDifferent (conjuntos de Hall), acionado
+      junto com o AC-3 sempre que um domínio do grupo muda.
+
+    Cada heurística pode ser desligada para comparação.
+    """
+    def __init__(self, problema, usar_mrv=True, usar_lcv=True,
+                 forward_checking=True, usar_ac3=True):
+        self.problema = problema
+        self.usar_mrv = usar_mrv
+        self.usar_lcv = usar_lcv
+        self.forward_checking = forward_checking
+        self.usar_ac3 = usar_ac3
+        self.nos_visitados = 0
+
+    def _revisar(self, dominios, i, j):
+        """Remove de 'i' os valores sem suporte em 'j'. Retorna True se houve poda."""
+        suporte = self.problema.suportes[(i, j)]
+        dominio_j = dominios[j]
+        restantes = dominios[i]
+        novo = restantes
+        while restantes:
+            bit = restantes & -restantes
+            restantes ^= bit
+            if not suporte(bit.bit_length() - 1) & dominio_j:
+                novo ^= bit
+        if novo != dominios[i]:
+            dominios[i] = novo
+            return True
+        return False
+
+    def _propagar_todos_diferentes(self, dominios, grupo):
+        """
+        Poda o AllDifferent 'grupo' até um ponto fixo:
+          - se c variáveis têm domínios contidos numa máscara com c valores
+            (conjunto de Hall; um valor fixo é o caso c = 1), esses valores
+            saem das demais; com mais de c variáveis, não há solução;
+          - se os valores disponíveis são exatamente tantos quanto as
+            variáveis, todos serão usados, e um valor que só uma variável
+            aceita é atribuído a ela.
+        Os conjuntos de Hall testados são os próprios domínios das variáveis,
+        o que pega os casos comuns em O(k²) sem enumerar subconjuntos.
+        Retorna (consistente, variáveis alteradas).
+        """
+        membros = self.problema.todos_diferentes[grupo]
+        alteradas = set()
+        mudou = True
+        while mudou:
+            mudou = False
+            for mascara in {dominios[i] for i in membros}:
+                dentro = [i for i in membros if not dominios[i] & ~mascara]
+                valores = mascara.bit_count()
+                if len(dentro) > valores:
+                    return False, alteradas
+                if len(dentro) < valores:
+                    continue
+                for i in membros:
+                    if dominios[i] & mascara and dominios[i] & ~mascara:
+                        dominios[i] &= ~mascara
+                        alteradas.add(i)
+                        mudou = True
+
+            # Valores escondidos: OR dos domínios das outras variáveis via prefixos/sufixos
+            prefixos = [0]
+            for i in membros:
+                prefixos.append(prefixos[-1] | dominios[i])
+            if prefixos[-1].bit_count() < len(membros):
+                return False, alteradas
+            if prefixos[-1].bit_count() > len(membros):
+                continue
+            sufixo = 0
+            for pos in range(len(membros) - 1, -1, -1):
+                i = membros[pos]
+                exclusivos = dominios[i] & ~(prefixos[pos] | sufixo)
+                sufixo |= dominios[i]
+                if exclusivos.bit_count() > 1:
+                    return False, alteradas
+                if exclusivos and dominios[i] != exclusivos:
+                    dominios[i] = exclusivos
+                    alteradas.add(i)
+                    mudou = True
+        return True, alteradas
+
+    def ac3(self, dominios, fila=None, grupos=(), atribuidas=()):
+        """
+        Algoritmo AC-3, estendido às restrições AllDifferent: cada domínio
+        alterado recoloca na fila os arcos que chegam nele e os grupos
+        AllDifferent que o contêm. Se 'fila' não for informada, parte de
+        todos os arcos e grupos. Arcos que revisariam variáveis em
+        'atribuidas' são pulados (a poda do forward checking já garantiu seu
+        suporte).
+        Retorna False se algum domínio ficar vazio (inconsistência).
+        """
+        vizinhos = self.problema.vizinhos
+        grupos_de = self.problema.grupos_de
+        if fila is None:
+            fila = list(self.problema.suportes)
+            grupos = range(len(self.problema.todos_diferentes))
+        pendentes = set(fila)
+        fila = list(pendentes)
+        grupos_pendentes = set(grupos)
+
+        def enfileirar(x, exceto):
+            for k in vizinhos[x]:
+                if k != exceto and k not in atribuidas and (k, x) not in pendentes:
+                    pendentes.add((k, x))
+                    fila.append((k, x))
+            grupos_pendentes.update(grupos_de[x])
+
+        while fila or grupos_pendentes:
+            if fila:
+                i, j = fila.pop()
+                pendentes.discard((i, j))
+                if self._revisar(dominios, i, j):
+                    if dominios[i] == 0:
+                        return False
+                    enfileirar(i, j)
+                continue
+            grupo = grupos_pendentes.pop()
+            ok, alteradas = self._propagar_todos_diferentes(dominios, grupo)
+            if not ok:
+                return False
+            for x in alteradas:
+                enfileirar(x, None)
+            grupos_pendentes.discard(grupo)  # Já está em ponto fixo
+        return True
+
+    def _escolher_variavel(self, dominios, atribuidas):
+        """Seleciona a próxima variável (MRV + grau, ou ordem estática)."""
+        livres = [i for i in range(len(dominios)) if i not in atribuidas]
+        if not self.usar_mrv:
+            return livres[0]
+        vizinhos = self.problema.vizinhos
+        todos_diferentes, grupos_de = self.problema.todos_diferentes, self.problema.grupos_de
+
+        def grau(i):
+            binarias = sum(1 for j in vizinhos[i] if j not in atribuidas)
+            return binarias + sum(1 for g in grupos_de[i] for j in todos_diferentes[g]
+                                  if j != i and j not in atribuidas)
+
+        return min(livres, key=lambda i: (dominios[i].bit_count(), -grau(i)))
+
+    def _ordenar_valores(self, var, dominios, atribuidas):
+        """Retorna os índices de valores do domínio (LCV ou ordem natural)."""
+        valores = []
+        restantes = dominios[var]
+        while restantes:
+            bit = restantes & -restantes
+            restantes ^= bit
+            valores.append(bit.bit_length() - 1)
+        if not self.usar_lcv:
+            return valores
+
+        suportes = self.problema.suportes
+        vizinhos_livres = [j for j in self.problema.vizinhos[var] if j not in atribuidas]
+        colegas_livres = [j for g in self.problema.grupos_de[var]
+                          for j in self.problema.todos_diferentes[g] if j != var and j not in atribuidas]
+
+        def eliminados(k):
+            binarias = sum((dominios[j] & ~suportes[(var, j)](k)).bit_count() for j in vizinhos_livres)
+            return binarias + sum(dominios[j] >> k & 1 for j in colegas_livres)
+
+        return sorted(valores, key=eliminados)
+
+    def _consistente(self, var, k, dominios, atribuidas):
+        """Sem propagação: confere o valor só contra as variáveis já atribuídas."""
+        suportes = self.problema.suportes
+        for j in self.problema.vizinhos[var]:
+            if j in atribuidas and not suportes[(var, j)](k) & dominios[j]:
+                return False
+        bit = 1 << k
+        for g in self.problema.grupos_de[var]:
+            for j in self.problema.todos_diferentes[g]:
+                if j != var and j in atribuidas and dominios[j] == bit:
+                    return False
+        return True
+
+    def _forward_checking(self, dominios, var, k, atribuidas):
+        """
+        Remove dos vizinhos livres de 'var' os valores incompatíveis com o
+        valor k (inclusive o próprio k nos grupos AllDifferent). Retorna a
+        lista das variáveis podadas, ou None se algum domínio esvaziar.
+        """
+        suportes = self.problema.suportes
+        alteradas = []
+        for j in self.problema.vizinhos[var]:
+            if j not in atribuidas:
+                podado = dominios[j] & suportes[(var, j)](k)
+                if podado != dominios[j]:
+                    if podado == 0:
+                        return None
+                    dominios[j] = podado
+                    alteradas.append(j)
+        bit = 1 << k
+        for g in self.problema.grupos_de[var]:
+            for j in self.problema.todos_diferentes[g]:
+                if j != var and j not in atribuidas and dominios[j] & bit:
+                    if dominios[j] == bit:
+                        return None
+                    dominios[j] ^= bit
+                    alteradas.append(j)
+        return alteradas
+
+    def _backtrack(self, dominios, atribuidas):
+        self.nos_visitados += 1
+        if len(atribuidas) == len(dominios):
+            return dominios
+
+        var = self._escolher_variavel(dominios, atribuidas)
+        propaga = self.forward_checking or self.usar_ac3
+
+        for k in self._ordenar_valores(var, dominios, atribuidas):
+            if not propaga and not self._consistente(var, k, dominios, atribuidas):
+                continue
+
+            novos = dominios[:]
+            novos[var] = 1 << k
+            atribuidas.add(var)
+
+            ok = True
+            if propaga:
+                # Revisar os arcos que chegam em 'var' é exatamente a poda do
+                # forward checking; o MAC roda mesmo com forward_checking=False
+                alteradas = self._forward_checking(novos, var, k, atribuidas)
+                ok = alteradas is not None
+                if ok and self.usar_ac3:
+                    vizinhos, grupos_de = self.problema.vizinhos, self.problema.grupos_de
+                    fila = [(m, j) for j in alteradas for m in vizinhos[j] if m not in atribuidas]
+                    grupos = set(grupos_de[var]).union(*(grupos_de[j] for j in alteradas))
+                    ok = self.ac3(novos, fila, grupos, atribuidas)
+
+            if ok:
+                resultado = self._backtrack(novos, atribuidas)
+                if resultado is not None:
+                    return resultado
+            atribuidas.discard(var)
+
+        return None
+
+    def resolver(self):
+        """
+        Resolve o CSP. Retorna um dicionário {variavel: valor} ou None.
+        """
+        self.nos_visitados = 0
+        dominios = self.problema.dominios_iniciais()
+        if self.usar_ac3 and not self.ac3(dominios):
+            return None
+        resultado = self._backtrack(dominios, set())
+        if resultado is None:
+            return None
+        return {
+            var: self.problema.valores[i][resultado[i].bit_length() - 1]
+            for i, var in enumerate(self.problema.variaveis)
+        }
+
+def criar_csp_n_rainhas(n):
+    """
+    Modela as N-Rainhas no motor genérico: uma variável por coluna, com
+    domínio 0..N-1 (linha). Para o par de colunas (i, j), a linha r de i
+    exclui em j as linhas r e r ± |i - j|, então a máscara de suporte tem
+    fórmula fechada e não precisa ser tabelada.
+    """
+    mascara_cheia = (1 << n) - 1
+    problema = ProblemaCSP(range(n), {col: range(n) for col in range(n)})
+
+    def suporte_distancia(d):
+        return lambda r: mascara_cheia & ~((1 << r) | (1 << (r + d)) | ((1 << (r - d)) if r >= d else 0))
+
+    for i in range(n):
+        for j in range(i + 1, n):
+            suporte = suporte_distancia(j - i)
+            problema.adicionar_restricao_suporte(i, j, suporte, suporte)
+    return problema
+
+class ResolvedorNRainhasCSP(ResolvedorNRainhas):
+    """
+    N-Rainhas resolvido pelo motor genérico (MRV, LCV, forward checking e AC-3).
+    """
+    def __init__(self, n, **opcoes):
+        super().__init__(n)
+        self.resolvedor_csp = ResolvedorCSP(criar_csp_n_rainhas(n), **opcoes)
+
+    def resolver(self):
+        atribuicao = self.resolvedor_csp.resolver()
+        self.nos_visitados = self.resolvedor_csp.nos_visitados
+        if atribuicao is None:
+            return None
+        self.posicoes = [atribuicao[col] for col in range(self.n)]
+        return self.posicoes
+
+# --- ENUMERAÇÃO RETOMÁVEL DE SOLUÇÕES ---
+
+class EnumeradorNRainhas:
+    """
+    Enumera TODAS as soluções das N-Rainhas sem recursão.
+
+    A busca é um backtracking com máscaras de bits sobre uma pilha
+    explícita: cada nível guarda (linhas, diag_desc, diag_asc, livres) da
+    coluna correspondente, onde 'livres' são as linhas ainda não tentadas.
+    Como todo o estado está na pilha, ele pode ser salvo em disco e a
+    enumeração retomada depois do ponto exato em que parou, sem repetir
+    nem perder soluções e sem guardar as soluções em memória.
+    """
+    def __init__(self, n):
+        self.n = n
+        self.mascara_cheia = (1 << n) - 1
+        self.nos_visitados = 0
+        self.solucoes_encontradas = 0
+        self._pilha = [(0, 0, 0, self.mascara_cheia)] if n > 0 else []
+        self._posicoes = []  # Linhas escolhidas nas colunas abaixo do topo da pilha
+
+    @property
+    def concluido(self):
+        """True quando a árvore de busca foi esgotada."""
+        return not self._pilha
+
+    def __iter__(self):
+        return self.solucoes()
+
+    def solucoes(self, caminho_checkpoint=None, intervalo_checkpoint=100_000):
+        """
+        Gerador preguiçoso de soluções (listas: índice = coluna, valor = linha).
+
+        Se 'caminho_checkpoint' for informado, o estado é salvo a cada
+        'intervalo_checkpoint' nós e ao final da enumeração. O gerador só
+        avança quando a próxima solução é pedida, então o estado salvo já
+        conta como entregues todas as soluções produzidas até ali.
+
+        O salvamento acontece só no topo do laço, antes de retirar o próximo
+        bit: ali a pilha, 'posicoes' e o contador de soluções estão
+        consistentes entre si. Salvar depois de retirar o bit, mas antes de
+        empilhar o filho ou contar a solução, perderia essa subárvore.
+        """
+        n = self.n
+        mascara_cheia = self.mascara_cheia
+        pilha = self._pilha
+        posicoes = self._posicoes
+        ultimo_salvamento = self.nos_visitados
+
+        while pilha:
+            if caminho_checkpoint and self.nos_visitados - ultimo_salvamento >= intervalo_checkpoint:
+                self.salvar(caminho_checkpoint)
+                ultimo_salvamento = self.nos_visitados
+
+            linhas, diag_desc, diag_asc, livres = pilha[-1]
+            if not livres:
+                # Coluna esgotada: volta para a anterior (BACKTRACK)
+                pilha.pop()
+                if posicoes:
+                    posicoes.pop()
+                continue
+
+            bit = livres & -livres
+            pilha[-1] = (linhas, diag_desc, diag_asc, livres ^ bit)
+            self.nos_visitados += 1
+            linha = bit.bit_length() - 1
+
+            if len(pilha) == n:
+                # Última coluna preenchida: solução completa
+                self.solucoes_encontradas += 1
+                yield posicoes + [linha]
+                continue
+
+            posicoes.append(linha)
+            novas_linhas = linhas | bit
+            novo_desc = ((diag_desc | bit) << 1) & mascara_cheia
+            novo_asc = (diag_asc | bit) >> 1
+            pilha.append((novas_linhas, novo_desc, novo_asc,
+                          ~(novas_linhas | novo_desc | novo_asc) & mascara_cheia))
+
+        if caminho_checkpoint:
+            self.salvar(caminho_checkpoint)
+
+    def estado(self):
+        """Estado serializável da enumeração (o conteúdo de um checkpoint)."""
+        return {
+            'n': self.n,
+            'pilha': [list(nivel) for nivel in self._pilha],
+            'posicoes': list(self._posicoes),
+            'nos_visitados': self.nos_visitados,
+            'solucoes_encontradas': self.solucoes_encontradas,
+        }
+
+    def salvar(self, caminho):
+        """
+        Grava o estado da enumeração em JSON. A escrita é feita em um arquivo
+        temporário e renomeada, para que uma interrupção no meio da gravação
+        não corrompa o checkpoint anterior.
+        """
+        temporario = caminho + ".tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(self.estado(), f)
+        os.replace(temporario, caminho)
+
+    @classmethod
+    def de_estado(cls, estado):
+        """Recria um enumerador a partir de um dicionário produzido por estado()."""
+        enumerador = cls(estado['n'])
+        enumerador._pilha = [tuple(nivel) for nivel in estado['pilha']]
+        enumerador._posicoes = list(estado['posicoes'])
+        enumerador.nos_visitados = estado['nos_visitados']
+        enumerador.solucoes_encontradas = estado['solucoes_encontradas']
+        return enumerador
+
+    @classmethod
+    def carregar(cls, caminho):
+        """Recria um enumerador a partir de um checkpoint salvo por salvar()."""
+        with open(caminho, encoding='utf-8') as f:
+            return cls.de_estado(json.load(f))
+
 if __name__ == "__main__":
     try:
         n_str = input("Digite o tamanho do tabuleiro (N): ")
@@ -113,19 +936,43 @@ if __name__ == "__main__":
             print(f"Resolvendo o problema das {N}-Rainhas...")
             
             resolvedor = ResolvedorNRainhas(N)
-            
+
+            # Para N grande o backtracking esbarra no limite de recursão;
+            # usamos a busca local por conflitos mínimos.
+            usar_min_conflitos = N > 200
+
             inicio = time.time()
-            solucao = resolvedor.resolver()
+            if usar_min_conflitos:
+                solucao = resolvedor.resolver_min_conflitos()
+            else:
+                solucao = resolvedor.resolver()
             tempo = time.time() - inicio
             
-            if solucao:
+            if solucao is not None:
                 resolvedor.imprimir_solucao(solucao)
                 print("\n" + "="*30)
                 print("MÉTRICAS DA BUSCA")
                 print("="*30)
-                print(f"Solução encontrada (coluna: linha): {list(enumerate(solucao))}")
+                if not usar_min_conflitos:
+                    print(f"Solução encontrada (coluna: linha): {list(enumerate(solucao))}")
                 print(f"Nós (estados) visitados: {resolvedor.nos_visitados}")
                 print(f"Tempo de execução: {tempo*1000:.2f} ms")
+
+                if not usar_min_conflitos:
+                    # Comparação com a versão de máscaras de bits
+                    resolvedor_bits = ResolvedorNRainhasBitmask(N)
+                    inicio = time.time()
+                    resolvedor_bits.resolver()
+                    tempo_bits = time.time() - inicio
+                    print(f"Versão bitmask: {resolvedor_bits.nos_visitados} nós em {tempo_bits*1000:.2f} ms")
+
+                    # Comparação com o motor genérico (MRV + LCV + FC + AC-3).
+                    # O AC-3 sobre todos os pares de colunas é caro para N grande.
+                    resolvedor_csp = ResolvedorNRainhasCSP(N, usar_ac3=N <= 60)
+                    inicio = time.time()
+                    resolvedor_csp.resolver()
+                    tempo_csp = time.time() - inicio
+                    print(f"Motor CSP genérico: {resolvedor_csp.nos_visitados} nós em {tempo_csp*1000:.2f} ms")
             else:
                 print(f"Nenhuma solução foi encontrada para N={N}.")
 
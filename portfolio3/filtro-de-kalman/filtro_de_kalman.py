@@ -1,15 +1,125 @@
+import argparse
+import time
+
 import numpy as np
 import matplotlib.pyplot as plt
 
+# SciPy é opcional: sem ele, usamos equivalentes mais lentos do NumPy
+try:
+    from scipy.linalg import cho_factor, cho_solve, solve_discrete_are, solve_triangular
+except ImportError:
+    cho_factor = cho_solve = solve_discrete_are = solve_triangular = None
+
+def resolver_dare(F, H, Q, R, tolerancia=1e-12, max_iteracoes=100_000):
+    """
+    Covariância a priori estacionária P, solução da equação algébrica de
+    Riccati discreta P = FPF' - FPH'(HPH' + R)^-1 HPF' + Q.
+    Usa scipy.linalg.solve_discrete_are quando o SciPy está instalado e,
+    caso contrário, itera a recursão de Riccati até convergir.
+    """
+    if solve_discrete_are is not None:
+        return solve_discrete_are(F.T, H.T, Q, R)
+
+    P = Q.copy()
+    for _ in range(max_iteracoes):
+        S = H @ P @ H.T + R
+        K = np.linalg.solve(S, H @ P).T
+        P_novo = F @ (P - K @ H @ P) @ F.T + Q
+        if np.max(np.abs(P_novo - P)) <= tolerancia * max(1.0, np.max(np.abs(P))):
+            return P_novo
+        P = P_novo
+    raise RuntimeError("A recursão de Riccati não convergiu.")
+
+def _resolver_spd(S, B):
+    """Resolve S X = B para S simétrica definida positiva, sem inverter S."""
+    if cho_factor is not None:
+        return cho_solve(cho_factor(S, lower=True, check_finite=False), B, check_finite=False)
+    # Sem SciPy: Cholesky do NumPy e duas substituições (via solve genérico)
+    L = np.linalg.cholesky(S)
+    return np.linalg.solve(L.T, np.linalg.solve(L, B))
+
+def _resolver_triangular_inferior(L, B, transposta=False):
+    """Resolve L X = B (ou L' X = B, com 'transposta') para L triangular inferior."""
+    if solve_triangular is not None:
+        return solve_triangular(L, B, lower=True, trans='T' if transposta else 'N', check_finite=False)
+    return np.linalg.solve(L.T if transposta else L, B)
+
+def _raiz_matriz(M):
+    """Fator L com M = LL' (Cholesky; para M só semidefinida, via autovalores)."""
+    try:
+        return np.linalg.cholesky(M)
+    except np.linalg.LinAlgError:
+        autovalores, autovetores = np.linalg.eigh(M)
+        return autovetores * np.sqrt(np.clip(autovalores, 0, None))
+
 class KalmanFilterLinear:
-    """Implementação genérica de um Filtro de Kalman Linear."""
-    def __init__(self, F, H, Q, R, x0, P0):
+    """
+    Implementação genérica de um Filtro de Kalman Linear.
+
+    A atualização nunca inverte S: o ganho vem de uma fatoração de Cholesky
+    com substituições triangulares ou, quando R é diagonal, de atualizações
+    escalares sequenciais (uma por componente da medição). 'forma_covariancia'
+    escolhe como P é atualizada: "simples" usa (I - KH)P; "joseph" usa
+    (I - KH)P(I - KH)' + KRK', que preserva simetria e positividade em
+    execuções longas; "raiz_quadrada" propaga um fator L com P = LL' via
+    decomposições QR, de modo que P nunca perde a positividade.
+
+    Com F, H, Q e R constantes, a covariância converge para um valor fixo e
+    o ganho também. 'ganho_estacionario' ativa um modo que aproveita isso:
+    "dare" resolve a equação de Riccati na construção; "convergencia" roda o
+    filtro completo até o ganho parar de mudar. A partir daí, cada passo usa
+    o ganho fixo e não recalcula P, S nem K.
+    """
+    MODOS_ESTACIONARIOS = (None, "dare", "convergencia")
+    FORMAS_COVARIANCIA = ("simples", "joseph", "raiz_quadrada")
+
+    def __init__(self, F, H, Q, R, x0, P0, ganho_estacionario=None, tolerancia_convergencia=1e-9,
+                 forma_covariancia="simples", atualizacao_sequencial=None):
+        if ganho_estacionario not in self.MODOS_ESTACIONARIOS:
+            raise ValueError(f"Modo de ganho estacionário desconhecido: {ganho_estacionario!r}")
+        if forma_covariancia not in self.FORMAS_COVARIANCIA:
+            raise ValueError(f"Forma de covariância desconhecida: {forma_covariancia!r}")
         self.F = F  # Matriz de Transição de Estado
         self.H = H  # Matriz de Observação
         self.Q = Q  # Covariância do Ruído do Processo
         self.R = R  # Covariância do Ruído da Medição
         self.x = x0 # Estado Inicial
         self.P = P0 # Covariância Inicial
+        # Constantes usadas a cada passo, calculadas uma única vez
+        self.FT = np.asarray(F).T
+        self.HT = np.asarray(H).T
+        self.I = np.eye(np.asarray(F).shape[0])
+
+        self.forma_covariancia = forma_covariancia
+        R_diagonal = np.count_nonzero(R - np.diag(np.diag(R))) == 0
+        if atualizacao_sequencial is None:
+            atualizacao_sequencial = R_diagonal
+        elif atualizacao_sequencial and not R_diagonal:
+            raise ValueError("A atualização sequencial exige R diagonal.")
+        self.atualizacao_sequencial = atualizacao_sequencial
+        self._variancias_R = np.diag(R).astype(float)
+        if forma_covariancia == "raiz_quadrada":
+            self.L = _raiz_matriz(np.asarray(P0, dtype=float))
+            self._raiz_Q = _raiz_matriz(np.asarray(Q, dtype=float))
+            self._raiz_R = _raiz_matriz(np.asarray(R, dtype=float))
+
+        self.ganho_estacionario = ganho_estacionario
+        self.tolerancia_convergencia = tolerancia_convergencia
+        self.ganho_fixo = None  # K estacionário, quando já determinado
+        self._ganho_anterior = None
+        if ganho_estacionario == "dare":
+            P_priori = resolver_dare(np.asarray(F, float), np.asarray(H, float),
+                                     np.asarray(Q, float), np.asarray(R, float))
+            S = H @ P_priori @ self.HT + R
+            self._fixar_ganho(_resolver_spd(S, H @ P_priori).T, P_priori)
+
+    def _fixar_ganho(self, K, P_priori):
+        """Congela o ganho e as covariâncias a priori e a posteriori estacionárias."""
+        self.ganho_fixo = K
+        self._P_priori_fixa = P_priori
+        A = self.I - K @ self.H
+        # Forma de Joseph: a P estacionária guardada fica exatamente simétrica
+        self._P_posteriori_fixa = A @ P_priori @ A.T + K @ self.R @ K.T
 
     def predict(self, u=None):
         """Passo de Predição (A Priori)"""
@@ -21,27 +131,172 @@ class KalmanFilterLinear:
             # Para este exemplo simples, passamos Bu já calculado como u
             self.x = self.F @ self.x + u
             
-        # P = FPF' + Q
-        self.P = self.F @ self.P @ self.F.T + self.Q
+        # P = FPF' + Q (no modo estacionário, P já é conhecida)
+        if self.ganho_fixo is not None:
+            self.P = self._P_priori_fixa
+        elif self.forma_covariancia == "raiz_quadrada":
+            # [FL, raiz(Q)] = [L', 0] Q' => FPF' + Q = L'L'', sem formar P
+            pre = np.vstack([(self.F @ self.L).T, self._raiz_Q.T])
+            self.L = np.linalg.qr(pre, mode='r').T
+            self.P = self.L @ self.L.T
+        else:
+            self.P = self.F @ self.P @ self.FT + self.Q
         return self.x
 
     def update(self, z):
         """Passo de Atualização (A Posteriori)"""
+        if self.ganho_fixo is not None:
+            # Ganho fixo: só dois produtos matriz-vetor, x = x + K(z - Hx)
+            self.x = self.x + self.ganho_fixo @ (z - self.H @ self.x)
+            self.P = self._P_posteriori_fixa
+            return self.x
+
+        P_priori = self.P
+        if self.forma_covariancia == "raiz_quadrada":
+            K = self._atualizar_raiz_quadrada(z)
+        elif self.atualizacao_sequencial:
+            K = self._atualizar_sequencial(z)
+        else:
+            K = self._atualizar_cholesky(z)
+
+        # Detecta a convergência do ganho
+        if self.ganho_estacionario == "convergencia":
+            if K is None:
+                # Só a forma sequencial chega aqui sem K: K = P(+) H' R^-1 (R diagonal)
+                K = self.P @ self.HT / self._variancias_R
+            anterior = self._ganho_anterior
+            if anterior is not None and np.max(np.abs(K - anterior)) <= \
+                    self.tolerancia_convergencia * max(1.0, np.max(np.abs(K))):
+                self._fixar_ganho(K, P_priori)
+                self.P = self._P_posteriori_fixa
+            self._ganho_anterior = K
+        return self.x
+
+    def _atualizar_cholesky(self, z):
+        """Atualização em bloco; o ganho vem de Cholesky, não de inv(S)."""
         # Inovação (Resíduo): y = z - Hx
         y = z - self.H @ self.x
         
         # Covariância da Inovação: S = HPH' + R
-        S = self.H @ self.P @ self.H.T + self.R
+        HP = self.H @ self.P
+        S = HP @ self.HT + self.R
         
-        # Ganho de Kalman: K = PH'S^-1
-        K = self.P @ self.H.T @ np.linalg.inv(S)
+        # Ganho de Kalman: K = PH'S^-1, resolvendo S K' = HP (S e P simétricas)
+        K = _resolver_spd(S, HP).T
         
         # Atualiza Estado: x = x + Ky
         self.x = self.x + K @ y
         
-        # Atualiza Covariância: P = (I - KH)P
-        I = np.eye(self.F.shape[0])
-        self.P = (I - K @ self.H) @ self.P
+        # Atualiza Covariância
+        if self.forma_covariancia == "joseph":
+            A = self.I - K @ self.H
+            self.P = A @ self.P @ A.T + K @ self.R @ K.T
+        else:
+            self.P = self.P - K @ HP  # (I - KH)P
+        return K
+
+    def _atualizar_sequencial(self, z):
+        """
+        Com R diagonal, as componentes da medição são independentes e podem
+        ser incorporadas uma a uma: cada passo só divide por um escalar.
+        """
+        coluna = np.ndim(self.x) == 2  # x como vetor coluna (n, 1), como em main()
+        for i, r in enumerate(self._variancias_R):
+            h = self.H[i]                     # Linha i de H, (n,)
+            Ph = self.P @ h
+            s = h @ Ph + r                    # Variância escalar da inovação
+            k = Ph / s                        # Ganho desta componente, (n,)
+            self.x = self.x + (k[:, None] if coluna else k) * (z[i] - h @ self.x)
+            if self.forma_covariancia == "joseph":
+                # (I - kh)P(I - kh)' + rkk' expandida para o caso escalar:
+                # P - k(Ph)' - (Ph)k' + s kk', soma de termos simétricos
+                kPh = k[:, None] * Ph
+                self.P = self.P - kPh - kPh.T + s * (k[:, None] * k)
+            else:
+                # (I - kh)P = P - (Ph)(Ph)'/s; o produto externo de Ph por
+                # ele mesmo é exatamente simétrico em ponto flutuante
+                self.P = self.P - (Ph[:, None] * Ph) / s
+        return None
+
+    def _atualizar_raiz_quadrada(self, z):
+        """
+        Atualização na forma raiz quadrada: triangulariza, via QR, a matriz
+            [[raiz(R), HL],        [[raiz(S), 0],
+             [0,       L ]]   ->    [ K_barra, L(+)]]
+        O estado é corrigido com K_barra raiz(S)^-1 y, sem formar K; o ganho
+        K = K_barra raiz(S)^-1 só é calculado (por substituição triangular)
+        quando a detecção de convergência precisa dele.
+        """
+        m, n = self.H.shape
+        pre = np.zeros((m + n, m + n))
+        pre[:m, :m] = self._raiz_R
+        pre[:m, m:] = self.H @ self.L
+        pre[m:, m:] = self.L
+        pos = np.linalg.qr(pre.T, mode='r').T
+        raiz_S, K_barra = pos[:m, :m], pos[m:, :m]
+        self.L = pos[m:, m:]
+        self.P = self.L @ self.L.T
+
+        y = z - self.H @ self.x
+        self.x = self.x + K_barra @ _resolver_triangular_inferior(raiz_S, y)
+        if self.ganho_estacionario != "convergencia":
+            return None
+        # K = K_barra raiz(S)^-1  <=>  raiz(S)' K' = K_barra'
+        return _resolver_triangular_inferior(raiz_S, K_barra.T, transposta=True).T
+
+class KalmanFilterLote:
+    """
+    Filtro de Kalman Linear para N alvos de uma vez.
+    Todos os alvos compartilham o modelo (F, H, Q, R); os estados ficam em um
+    array (N, n) e as covariâncias em um array (N, n, n), de modo que
+    predição e atualização são algumas operações em lote do NumPy em vez de
+    N objetos KalmanFilterLinear.
+    """
+    def __init__(self, F, H, Q, R, x0, P0):
+        self.F = np.asarray(F, dtype=float)
+        self.H = np.asarray(H, dtype=float)
+        self.Q = np.asarray(Q, dtype=float)
+        self.R = np.asarray(R, dtype=float)
+        self.x = np.array(x0, dtype=float)  # (N, n)
+        n = self.F.shape[0]
+        # P0 pode ser uma única matriz (n, n), replicada para todos os alvos
+        self.P = np.array(np.broadcast_to(P0, (len(self.x), n, n)), dtype=float)
+
+    def predict(self, u=None):
+        """Passo de Predição para todos os alvos. 'u' é (n,) ou (N, n), com Bu já calculado."""
+        # x = Fx + Bu, linha a linha: x_i = F x_i
+        self.x = self.x @ self.F.T
+        if u is not None:
+            self.x = self.x + u
+        # P = FPF' + Q, em lote
+        self.P = np.einsum('ij,njk,lk->nil', self.F, self.P, self.F, optimize=True) + self.Q
+        return self.x
+
+    def update(self, z, mascara=None):
+        """
+        Passo de Atualização em lote. 'z' é (N, m). 'mascara' (N,) indica os
+        alvos observados nesta varredura; os demais mantêm a estimativa a priori.
+        """
+        if mascara is None:
+            indices = slice(None)
+        else:
+            indices = np.flatnonzero(mascara)
+            if len(indices) == 0:
+                return self.x
+        x, P, z = self.x[indices], self.P[indices], np.asarray(z, dtype=float)[indices]
+
+        # Inovação: y = z - Hx
+        y = z - x @ self.H.T
+        # HP (N, m, n) é reaproveitado em S, no ganho e na covariância
+        HP = np.einsum('ij,njk->nik', self.H, P, optimize=True)
+        # S = HPH' + R
+        S = np.einsum('nik,jk->nij', HP, self.H, optimize=True) + self.R
+        # K = PH'S^-1, via sistema linear em lote: S K' = HP (S e P simétricas)
+        K = np.swapaxes(np.linalg.solve(S, HP), 1, 2)
+
+        # x = x + Ky ; P = P - K(HP) = (I - KH)P
+        self.x[indices] = x + np.einsum('nij,nj->ni', K, y)
+        self.P[indices] = P - K @ HP
         return self.x
 
 def simular_balistica(dt=0.1, steps=50):
@@ -82,6 +337,109 @@ def simular_balistica(dt=0.1, steps=50):
         
     return trajetoria_real, medicoes
 
+def simular_balistica_lote(num_alvos, dt=0.1, steps=50, sigma=3.0, prob_deteccao=0.9, seed=0):
+    """
+    Versão vetorizada de simular_balistica para muitos projéteis.
+    Retorna as medições (steps, N, 2) e a máscara (steps, N) de alvos
+    detectados: um alvo some ao tocar o chão ou, a cada varredura, com
+    probabilidade 1 - prob_deteccao.
+    """
+    rng = np.random.default_rng(seed)
+    g = 9.81
+    posicao = np.zeros((num_alvos, 2))
+    velocidade = np.column_stack([rng.uniform(10, 30, num_alvos), rng.uniform(15, 35, num_alvos)])
+    medicoes = np.empty((steps, num_alvos, 2))
+    mascara = np.empty((steps, num_alvos), dtype=bool)
+    for passo in range(steps):
+        posicao += velocidade * dt
+        velocidade[:, 1] -= g * dt
+        medicoes[passo] = posicao + rng.normal(0, sigma, (num_alvos, 2))
+        mascara[passo] = (posicao[:, 1] >= 0) & (rng.random(num_alvos) < prob_deteccao)
+    return medicoes, mascara
+
+def modelo_balistico(dt=0.1):
+    """Matrizes (F, H, Q, R) e controle u do modelo cinemático usado em main()."""
+    F = np.array([
+        [1, 0, dt, 0],
+        [0, 1, 0, dt],
+        [0, 0, 1, 0],
+        [0, 0, 0, 1]
+    ], dtype=float)
+    H = np.array([
+        [1, 0, 0, 0],
+        [0, 1, 0, 0]
+    ], dtype=float)
+    Q = np.eye(4) * 0.1
+    R = np.eye(2) * 9.0
+    u = np.array([0, 0, 0, -9.81 * dt])
+    return F, H, Q, R, u
+
+def medir_vazao_lote(num_alvos=10_000, steps=50, dt=0.1, comparar_individual=True):
+    """
+    Mede a vazão (trilhas atualizadas por segundo) do filtro em lote e,
+    opcionalmente, do laço de objetos KalmanFilterLinear sobre uma amostra.
+    """
+    F, H, Q, R, u = modelo_balistico(dt)
+    medicoes, mascara = simular_balistica_lote(num_alvos, dt=dt, steps=steps)
+
+    kf = KalmanFilterLote(F, H, Q, R, np.zeros((num_alvos, 4)), np.eye(4) * 500)
+    inicio = time.perf_counter()
+    for passo in range(steps):
+        kf.predict(u=u)
+        kf.update(medicoes[passo], mascara[passo])
+    tempo_lote = time.perf_counter() - inicio
+    resultado = {'alvos': num_alvos, 'passos': steps,
+                 'trilhas_por_segundo_lote': num_alvos * steps / tempo_lote}
+
+    if comparar_individual:
+        # O laço de objetos é medido numa amostra e extrapolado por trilha
+        amostra = min(num_alvos, 200)
+        filtros = [KalmanFilterLinear(F, H, Q, R, np.zeros((4, 1)), np.eye(4) * 500) for _ in range(amostra)]
+        u_coluna = u.reshape(4, 1)
+        inicio = time.perf_counter()
+        for passo in range(steps):
+            for i, filtro in enumerate(filtros):
+                filtro.predict(u=u_coluna)
+                if mascara[passo, i]:
+                    filtro.update(medicoes[passo, i].reshape(2, 1))
+        tempo_individual = time.perf_counter() - inicio
+        resultado['trilhas_por_segundo_individual'] = amostra * steps / tempo_individual
+        # Sanidade: o lote deve coincidir com os filtros individuais
+        resultado['diferenca_maxima'] = float(max(
+            np.abs(filtro.x[:, 0] - kf.x[i]).max() for i, filtro in enumerate(filtros)))
+    return resultado
+
+def medir_latencia(ganho_estacionario=None, steps=20_000, dt=0.1):
+    """Tempo médio (µs) de um ciclo predict + update de um único filtro."""
+    F, H, Q, R, u = modelo_balistico(dt)
+    kf = KalmanFilterLinear(F, H, Q, R, np.zeros((4, 1)), np.eye(4) * 500,
+                            ganho_estacionario=ganho_estacionario)
+    rng = np.random.default_rng(0)
+    medicoes = rng.normal(0, 3.0, (steps, 2, 1))
+    u = u.reshape(4, 1)
+    inicio = time.perf_counter()
+    for z in medicoes:
+        kf.predict(u=u)
+        kf.update(z)
+    return (time.perf_counter() - inicio) / steps * 1e6
+
+def main_lote(argv=None):
+    """CLI de medição de vazão do filtro em lote."""
+    parser = argparse.ArgumentParser(description="Vazão do Filtro de Kalman em lote (trilhas/s).")
+    parser.add_argument('--alvos', type=int, default=10_000)
+    parser.add_argument('--passos', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    resultado = medir_vazao_lote(args.alvos, args.passos)
+    print(f"Alvos: {resultado['alvos']} | Passos: {resultado['passos']}")
+    print(f"Filtro em lote:      {resultado['trilhas_por_segundo_lote']:,.0f} trilhas/s")
+    print(f"Filtros individuais: {resultado['trilhas_por_segundo_individual']:,.0f} trilhas/s")
+    print(f"Diferença máxima entre as estimativas: {resultado['diferenca_maxima']:.2e}")
+
+    print("Latência por medição (filtro único):")
+    for modo in KalmanFilterLinear.MODOS_ESTACIONARIOS:
+        print(f"  ganho_estacionario={modo!s:<12} {medir_latencia(modo):6.1f} µs")
+
 def main():
     print("Iniciando Rastreamento Balístico com Filtro de Kalman...")
     
@@ -155,4 +513,11 @@ def main():
     print("Gráfico salvo em 'kalman_balistica.png'")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import sys
+    # Sem argumentos: rastreamento de um projétil com gráfico.
+    # Com argumentos: medição de vazão do filtro em lote. Ex.:
+    # python3 filtro_de_kalman.py --alvos 10000 --passos 50
+    if len(sys.argv) > 1:
+        main_lote()
+    else:
+        main()